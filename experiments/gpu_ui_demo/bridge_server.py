@@ -3,12 +3,16 @@
 
 from __future__ import annotations
 
+import argparse
 import asyncio
 import json
+import os
 import signal
+import socket
 import sys
+from collections import deque
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Awaitable, Callable, Dict, Optional
 
 ROOT = Path(__file__).resolve().parents[2]
 CORE_ROOT = ROOT / 'core'
@@ -19,37 +23,165 @@ if str(CORE_ROOT) not in sys.path:
 
 from central.core import ChatClient  # type: ignore  # pylint: disable=wrong-import-position  # noqa: E402
 
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
+
+try:
+    import uvloop  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    uvloop = None  # type: ignore
+
 DEFAULT_ADDR = "127.0.0.1"
 DEFAULT_PORT = 4510
+DELTA_FLUSH_INTERVAL = 0.004
+DELTA_FLUSH_CHARS = 64 * 1024
+WRITE_BUFFER_HIGH = 1024 * 1024
+WRITE_BUFFER_LOW = 256 * 1024
+# The transport only pauses writing past WRITE_BUFFER_HIGH, so drain() is a no-op below it.
+DRAIN_HIGH_WATER = WRITE_BUFFER_HIGH
+
+
+SYSTEM_PROMPT_CANDIDATES = (
+    ROOT / "memory" / "system_prompt.local.md",
+    ROOT / "memory" / "system_prompt.local.txt",
+    ROOT / "memory" / "system_prompt.md",
+    ROOT / "memory" / "system_prompt.txt",
+)
+
+# Last prompt read from disk, keyed by (path, mtime_ns) so reconnects only pay a stat().
+_prompt_cache: Dict[str, Any] = {"key": None, "text": None}
 
 
 def load_system_prompt() -> str | None:
-    for candidate in (
-        ROOT / "memory" / "system_prompt.local.md",
-        ROOT / "memory" / "system_prompt.local.txt",
-        ROOT / "memory" / "system_prompt.md",
-        ROOT / "memory" / "system_prompt.txt",
-    ):
+    for candidate in SYSTEM_PROMPT_CANDIDATES:
         try:
-            if candidate.exists():
-                return candidate.read_text(encoding="utf-8").strip()
+            key = (candidate, candidate.stat().st_mtime_ns)
+        except OSError:
+            continue
+        if _prompt_cache["key"] == key:
+            return _prompt_cache["text"]
+        try:
+            text = candidate.read_text(encoding="utf-8").strip()
         except Exception:
             continue
+        _prompt_cache["key"] = key
+        _prompt_cache["text"] = text
+        return text
     return None
 
 
-async def send_json(writer: asyncio.StreamWriter, payload: Dict[str, Any]) -> None:
-    data = json.dumps(payload, ensure_ascii=False)
-    writer.write((data + "\n").encode("utf-8"))
+def dumps(payload: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def loads(data: bytes) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data.decode("utf-8"))
+
+
+async def send_json(writer: asyncio.StreamWriter, payload: Dict[str, Any], *, lazy_drain: bool = False) -> None:
+    writer.writelines((dumps(payload), b"\n"))
+    # Delta frames skip the drain round-trip until the transport actually has a backlog.
+    if lazy_drain and writer.transport.get_write_buffer_size() <= DRAIN_HIGH_WATER:
+        return
     try:
         await writer.drain()
     except ConnectionError:
         pass
 
 
+async def relay_deltas(
+    writer: asyncio.StreamWriter,
+    pending: deque[str],
+    wake: asyncio.Event,
+    finished: asyncio.Event,
+) -> None:
+    """Coalesce streamed pieces so each frame carries every token produced within a short window."""
+
+    while True:
+        await wake.wait()
+        if not finished.is_set():
+            await asyncio.sleep(DELTA_FLUSH_INTERVAL)
+        wake.clear()
+        pieces: list[str] = []
+        size = 0
+        while pending:
+            piece = pending.popleft()
+            pieces.append(piece)
+            size += len(piece)
+            if size >= DELTA_FLUSH_CHARS:
+                await send_json(writer, {"type": "delta", "text": "".join(pieces)}, lazy_drain=True)
+                pieces = []
+                size = 0
+        if pieces:
+            await send_json(writer, {"type": "delta", "text": "".join(pieces)}, lazy_drain=True)
+        if finished.is_set() and not pending:
+            return
+
+
+async def handle_prompt(
+    writer: asyncio.StreamWriter,
+    message: Dict[str, Any],
+    client: ChatClient,
+    system_prompt: str | None,
+) -> None:
+    text = str(message.get("text") or "")
+    if not text.strip():
+        await send_json(writer, {"type": "error", "message": "empty prompt"})
+        return
+
+    loop = asyncio.get_running_loop()
+    pending: deque[str] = deque()
+    wake = asyncio.Event()
+    finished = asyncio.Event()
+    relay = asyncio.create_task(relay_deltas(writer, pending, wake, finished))
+
+    def on_delta(piece: str) -> None:
+        if not piece:
+            return
+        pending.append(piece)
+        loop.call_soon_threadsafe(wake.set)
+
+    error: str | None = None
+    try:
+        assistant = await asyncio.to_thread(client.one_turn, text, on_delta=on_delta)
+    except Exception as exc:  # pragma: no cover - defensive
+        assistant, error = None, str(exc)
+    finished.set()
+    wake.set()
+    await relay
+    if error is not None:
+        await send_json(writer, {"type": "error", "message": error})
+        return
+    await send_json(writer, {"type": "done", "text": assistant or ""})
+
+
+async def handle_reset(
+    writer: asyncio.StreamWriter,
+    message: Dict[str, Any],
+    client: ChatClient,
+    system_prompt: str | None,
+) -> None:
+    client.reset_messages(system=system_prompt)
+    await send_json(writer, {"type": "status", "message": "session reset"})
+
+
+Handler = Callable[[asyncio.StreamWriter, Dict[str, Any], ChatClient, Optional[str]], Awaitable[None]]
+
+HANDLERS: Dict[str, Handler] = {
+    "prompt": handle_prompt,
+    "reset": handle_reset,
+}
+
+
 async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
     peer = writer.get_extra_info("peername")
-    loop = asyncio.get_running_loop()
+    writer.transport.set_write_buffer_limits(high=WRITE_BUFFER_HIGH, low=WRITE_BUFFER_LOW)
 
     system_prompt = load_system_prompt()
     client = ChatClient(stream=True, sanitize=False)
@@ -67,37 +199,17 @@ async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWrit
         if not data:
             break
         try:
-            message = json.loads(data.decode("utf-8"))
+            message = loads(data)
         except json.JSONDecodeError as exc:  # pragma: no cover - defensive
             await send_json(writer, {"type": "error", "message": f"invalid json: {exc}"})
             continue
 
         kind = message.get("type")
-        if kind == "prompt":
-            text = str(message.get("text") or "")
-            if not text.strip():
-                await send_json(writer, {"type": "error", "message": "empty prompt"})
-                continue
-
-            def on_delta(piece: str) -> None:
-                if not piece:
-                    return
-                asyncio.run_coroutine_threadsafe(
-                    send_json(writer, {"type": "delta", "text": piece}),
-                    loop,
-                )
-
-            try:
-                assistant = await asyncio.to_thread(client.one_turn, text, on_delta=on_delta)
-            except Exception as exc:  # pragma: no cover - defensive
-                await send_json(writer, {"type": "error", "message": str(exc)})
-                continue
-            await send_json(writer, {"type": "done", "text": assistant or ""})
-        elif kind == "reset":
-            client.reset_messages(system=system_prompt)
-            await send_json(writer, {"type": "status", "message": "session reset"})
-        else:
+        handler = HANDLERS.get(kind) if isinstance(kind, str) else None
+        if handler is None:
             await send_json(writer, {"type": "error", "message": f"unknown command: {kind}"})
+            continue
+        await handler(writer, message, client, system_prompt)
 
     try:
         writer.close()
@@ -106,10 +218,16 @@ async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWrit
         pass
 
 
-async def main() -> None:
+async def main(reuse_port: bool = False) -> None:
     addr = DEFAULT_ADDR
     port = int(DEFAULT_PORT)
-    server = await asyncio.start_server(handle_client, addr, port)
+    # SO_REUSEPORT only for --workers: otherwise a second bridge must fail with EADDRINUSE.
+    server = await asyncio.start_server(
+        handle_client,
+        addr,
+        port,
+        reuse_port=reuse_port,
+    )
     sockets = ", ".join(str(sock.getsockname()) for sock in server.sockets or [])
     print(f"[bridge] listening on {sockets}")
 
@@ -131,8 +249,58 @@ async def main() -> None:
         await server.wait_closed()
 
 
+def can_share_port() -> bool:
+    return hasattr(os, "fork") and hasattr(socket, "SO_REUSEPORT")
+
+
+def spawn_workers(workers: int) -> list[int]:
+    """Fork ``workers - 1`` children that accept on the shared SO_REUSEPORT port.
+
+    Each process has its own interpreter (and GIL), so a ``ChatClient.one_turn`` that holds the
+    GIL only stalls the clients the kernel routed to that worker. Returns child pids in the parent
+    and an empty list in the children.
+    """
+
+    if workers <= 1:
+        return []
+    if not can_share_port():
+        print("[bridge] --workers needs fork() and SO_REUSEPORT; running a single process")
+        return []
+    children: list[int] = []
+    for _ in range(workers - 1):
+        pid = os.fork()
+        if pid == 0:
+            return []
+        children.append(pid)
+    return children
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="TCP bridge between ChatClient and the GPU demo UI.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Bridge processes sharing the port via SO_REUSEPORT (Linux/BSD; default: 1)",
+    )
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
+    args = parse_args()
+    children = spawn_workers(args.workers)
+    reuse_port = args.workers > 1 and can_share_port()
     try:
-        asyncio.run(main())
+        if uvloop is not None:
+            uvloop.run(main(reuse_port))
+        else:
+            asyncio.run(main(reuse_port))
     except KeyboardInterrupt:
         print("[bridge] stopped by user")
+    finally:
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+                os.waitpid(pid, 0)
+            except (ProcessLookupError, ChildProcessError):
+                pass
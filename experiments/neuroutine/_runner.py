@@ -0,0 +1,211 @@
+import argparse
+import os
+import queue
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import BinaryIO
+
+
+RS = b"\x1e"
+METRICS_PREFIX = b"NR|"
+READ_CHUNK = 65536
+STDERR_CHUNK = 65536
+
+# Bytes read past the last RS, kept per runner until the next read_until_rs call. Shared by
+# collect, eval and gate so a runner pair handed between them keeps its buffered bytes.
+_stdout_buffers: dict[subprocess.Popen, bytearray] = {}
+
+
+def repo_root() -> Path:
+    return Path(__file__).resolve().parents[1]
+
+
+def resolve_runner(root: Path, override: str | None) -> str:
+    if override:
+        return override
+    candidates = [
+        root / "bin" / "noxlocal",
+        root / "noxpy" / "localrunner" / "noxlocal",
+        root.parent / "noxpy" / "localrunner" / "noxlocal",
+    ]
+    for candidate in candidates:
+        if candidate.exists():
+            return str(candidate)
+    return "noxlocal"
+
+
+def read_until_rs(proc: subprocess.Popen) -> str:
+    stream = proc.stdout
+    if stream is None:
+        return ""
+    fd = stream.fileno()
+    buf = _stdout_buffers.setdefault(proc, bytearray())
+    while True:
+        idx = buf.find(RS)
+        if idx >= 0:
+            out = bytes(buf[:idx])
+            del buf[: idx + 1]
+            return out.decode("utf-8", errors="replace")
+        chunk = os.read(fd, READ_CHUNK)
+        if not chunk:
+            out = bytes(buf)
+            buf.clear()
+            return out.decode("utf-8", errors="replace")
+        buf.extend(chunk)
+
+
+def send_prompt(proc: subprocess.Popen, prompt: str | bytes | bytearray) -> str:
+    stdin = proc.stdin
+    if stdin is None:
+        raise RuntimeError("stdin unavailable")
+    data = prompt.encode("utf-8") if isinstance(prompt, str) else prompt
+    # bufsize=0 makes stdin a raw FileIO: one write() is one write(2), nothing to flush.
+    stdin.write(b"".join((data, RS)))
+    return read_until_rs(proc)
+
+
+def timed_send(proc: subprocess.Popen, prompt: str | bytes | bytearray) -> tuple[str, float]:
+    start = time.perf_counter()
+    out = send_prompt(proc, prompt)
+    return out, time.perf_counter() - start
+
+
+class MetricsReader(threading.Thread):
+    def __init__(self, stream: BinaryIO | None, verbose: bool) -> None:
+        super().__init__(daemon=True)
+        self.stream = stream
+        self.verbose = verbose
+        self.queue: queue.SimpleQueue[dict[str, float]] = queue.SimpleQueue()
+
+    def run(self) -> None:
+        if self.stream is None:
+            return
+        # stderr is unbuffered, so readline() would cost one syscall per byte.
+        fd = self.stream.fileno()
+        buf = bytearray()
+        while True:
+            chunk = os.read(fd, STDERR_CHUNK)
+            if not chunk:
+                break
+            buf.extend(chunk)
+            start = 0
+            while True:
+                nl = buf.find(b"\n", start)
+                if nl < 0:
+                    break
+                self.handle_line(bytes(buf[start : nl + 1]))
+                start = nl + 1
+            del buf[:start]
+        if buf:
+            self.handle_line(bytes(buf))
+
+    def handle_line(self, line: bytes) -> None:
+        if line.startswith(METRICS_PREFIX):
+            parsed = parse_metrics(line)
+            if parsed is not None:
+                self.queue.put(parsed)
+        elif self.verbose:
+            sys.stderr.buffer.write(line)
+            sys.stderr.buffer.flush()
+
+    def get(self, timeout: float) -> dict[str, float] | None:
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def drain(self) -> None:
+        # Drop metrics that arrived late for an earlier stage so they cannot pair with a new step.
+        while True:
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                return
+
+
+def parse_metrics(line: bytes) -> dict[str, float] | None:
+    # NR|token|max|second|margin -- float() parses ASCII bytes (and strips whitespace) directly.
+    try:
+        i1 = line.index(b"|", len(METRICS_PREFIX))
+        i2 = line.index(b"|", i1 + 1)
+        i3 = line.index(b"|", i2 + 1)
+        i4 = line.find(b"|", i3 + 1)
+        return {
+            "token": float(line[len(METRICS_PREFIX) : i1]),
+            "max": float(line[i1 + 1 : i2]),
+            "second": float(line[i2 + 1 : i3]),
+            "margin": float(line[i3 + 1 : i4] if i4 >= 0 else line[i3 + 1 :]),
+        }
+    except ValueError:
+        return None
+
+
+def start_runner(
+    runner: str,
+    model: str,
+    ctx: int,
+    batch: int,
+    fast: bool,
+    metrics: bool,
+) -> subprocess.Popen:
+    cmd = [
+        runner,
+        "-serve",
+        "-serve-rs",
+        "-raw",
+        "-keep-cache",
+        "-max-tokens",
+        "1",
+        "-ctx",
+        str(ctx),
+        "-batch",
+        str(batch),
+        "-model",
+        model,
+    ]
+    if fast:
+        cmd.append("-fast")
+    if metrics:
+        cmd.append("-metrics")
+    return subprocess.Popen(
+        cmd,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        bufsize=0,
+    )
+
+
+Runners = tuple[subprocess.Popen, subprocess.Popen, MetricsReader]
+
+
+def start_runners(args: argparse.Namespace) -> Runners:
+    root = repo_root()
+    runner = resolve_runner(root, args.runner)
+    tiny_default = root / "assets" / "models" / "tinyllama.gguf"
+    model_small = args.model_small or (
+        str(tiny_default) if tiny_default.exists() else str(root / "assets" / "models" / "nox.gguf")
+    )
+    model_large = args.model_large or str(root / "assets" / "models" / "mistral-7b-q4.gguf")
+
+    fast = not args.no_fast
+    small_proc = start_runner(runner, model_small, args.ctx, args.batch, fast, metrics=True)
+    large_proc = start_runner(runner, model_large, args.ctx, args.batch, fast, metrics=False)
+
+    metrics_reader = MetricsReader(small_proc.stderr, args.verbose)
+    metrics_reader.start()
+    return small_proc, large_proc, metrics_reader
+
+
+def stop_runners(runners: Runners) -> None:
+    for proc in runners[:2]:
+        try:
+            if proc.stdin:
+                proc.stdin.write(b"exit" + RS)
+                proc.stdin.flush()
+        except Exception:
+            pass
+        proc.terminate()
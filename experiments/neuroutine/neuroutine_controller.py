@@ -3,10 +3,15 @@ from __future__ import annotations
 
 import json
 import math
-import random
-from dataclasses import dataclass
 from pathlib import Path
 
+import numpy as np
+
+try:
+    from numba import njit  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    njit = None  # type: ignore
+
 
 def sigmoid(x: float) -> float:
     if x < -60.0:
@@ -16,10 +21,6 @@ def sigmoid(x: float) -> float:
     return 1.0 / (1.0 + math.exp(-x))
 
 
-def relu(x: float) -> float:
-    return x if x > 0.0 else 0.0
-
-
 def features_from_row(row: dict) -> list[float]:
     metrics = row.get("metrics") or {}
     token = row.get("draft") or ""
@@ -40,29 +41,22 @@ def features_from_metrics(metrics: dict[str, float], token: str) -> list[float]:
     ]
 
 
-def compute_norm(X: list[list[float]]) -> tuple[list[float], list[float]]:
-    if not X:
-        return [], []
-    n = len(X)
-    dims = len(X[0])
-    mean = [0.0] * dims
-    for row in X:
-        for i, v in enumerate(row):
-            mean[i] += v
-    mean = [m / max(1, n) for m in mean]
-    var = [0.0] * dims
-    for row in X:
-        for i, v in enumerate(row):
-            var[i] += (v - mean[i]) ** 2
-    std = [math.sqrt(v / max(1, n)) or 1.0 for v in var]
-    return mean, std
-
-
-def normalize(X: list[list[float]], mean: list[float], std: list[float]) -> list[list[float]]:
-    out: list[list[float]] = []
-    for row in X:
-        out.append([(v - m) / s if s > 0 else v for v, m, s in zip(row, mean, std)])
-    return out
+def compute_norm(X: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    # Column sums and sums of squares (float64 accumulators) give mean and std without the
+    # (X - mean) temporaries of X.std(); near-constant columns get std 1.
+    n, dims = X.shape
+    if n == 0:
+        return np.zeros(dims, dtype=X.dtype), np.ones(dims, dtype=X.dtype)
+    total = X.sum(axis=0, dtype=np.float64)
+    total_sq = np.einsum("ij,ij->j", X, X, dtype=np.float64)
+    mean = total / n
+    std = np.sqrt(np.maximum(total_sq / n - mean * mean, 0.0))
+    std[std <= 1e-6 * np.maximum(np.abs(mean), 1.0)] = 1.0
+    return mean.astype(X.dtype), std.astype(X.dtype)
+
+
+def np_sigmoid(z: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-np.clip(z, -60.0, 60.0)))
 
 
 def train_logreg(
@@ -71,36 +65,151 @@ def train_logreg(
     steps: int,
     lr: float,
     l2: float,
+    *,
+    batch_size: int = 0,
+    seed: int = 1,
 ) -> tuple[list[float], float]:
     n = len(X)
     if n == 0:
         return [], 0.0
-    dims = len(X[0])
-    w = [0.0] * dims
+    Xa = np.asarray(X, dtype=np.float32)
+    ya = np.asarray(y, dtype=np.float32)
+    w = np.zeros(Xa.shape[1], dtype=np.float32)
     b = 0.0
+    # batch_size < n switches to mini-batch SGD: each step costs O(batch) instead of O(n).
+    rng = np.random.default_rng(seed) if 0 < batch_size < n else None
+    xb, yb = Xa, ya
     for _ in range(steps):
-        grad_w = [0.0] * dims
-        grad_b = 0.0
-        for row, label in zip(X, y):
-            z = b + sum(wi * xi for wi, xi in zip(w, row))
-            pred = sigmoid(z)
-            err = pred - label
-            for i, xi in enumerate(row):
-                grad_w[i] += err * xi
-            grad_b += err
-        inv_n = 1.0 / max(1, n)
-        for i in range(dims):
-            grad_w[i] = grad_w[i] * inv_n + l2 * w[i]
-            w[i] -= lr * grad_w[i]
-        b -= lr * grad_b * inv_n
-    return w, b
-
-
-def logreg_prob(w: list[float], b: float, x: list[float]) -> float:
-    score = b
-    for wi, xi in zip(w, x):
-        score += wi * xi
-    return sigmoid(score)
+        if rng is not None:
+            idx = rng.integers(0, n, size=batch_size)
+            xb, yb = Xa[idx], ya[idx]
+        err = np_sigmoid(xb @ w + b) - yb
+        grad_w = xb.T @ err / len(yb) + l2 * w
+        w -= lr * grad_w
+        b -= lr * float(err.mean())
+    return w.tolist(), b
+
+
+def init_mlp(
+    dims: int,
+    hidden: int,
+    seed: int | np.random.Generator,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, float]:
+    # He init for the ReLU layer, LeCun for the sigmoid output; default_rng passes a Generator through.
+    rng = np.random.default_rng(seed)
+    W1 = rng.standard_normal((hidden, dims), dtype=np.float32) * np.float32(np.sqrt(2.0 / dims))
+    b1 = np.zeros(hidden, dtype=np.float32)
+    W2 = rng.standard_normal(hidden, dtype=np.float32) * np.float32(np.sqrt(1.0 / hidden))
+    return W1, b1, W2, 0.0
+
+
+def train_mlp_np(
+    X: np.ndarray,
+    y: np.ndarray,
+    W1: np.ndarray,
+    b1: np.ndarray,
+    W2: np.ndarray,
+    b2: float,
+    steps: int,
+    lr: float,
+    l2: float,
+) -> float:
+    n = X.shape[0]
+    for _ in range(steps):
+        Z1 = X @ W1.T + b1
+        H = np.maximum(Z1, 0.0)
+        prob = np_sigmoid(H @ W2 + b2)
+        dlogit = prob - y
+
+        gW2 = H.T @ dlogit / n + l2 * W2
+        gb2 = float(dlogit.mean())
+        dZ1 = np.outer(dlogit, W2) * (Z1 > 0.0)
+        gW1 = dZ1.T @ X / n + l2 * W1
+        gb1 = dZ1.sum(axis=0) / n
+
+        W1 -= lr * gW1
+        b1 -= lr * gb1
+        W2 -= lr * gW2
+        b2 -= lr * gb2
+    return b2
+
+
+def train_mlp_minibatch(
+    X: np.ndarray,
+    y: np.ndarray,
+    W1: np.ndarray,
+    b1: np.ndarray,
+    W2: np.ndarray,
+    b2: float,
+    steps: int,
+    lr: float,
+    l2: float,
+    batch_size: int,
+    rng: np.random.Generator,
+) -> float:
+    n = X.shape[0]
+    for _ in range(steps):
+        idx = rng.integers(0, n, size=batch_size)
+        b2 = train_mlp_np(X[idx], y[idx], W1, b1, W2, b2, 1, lr, l2)
+    return b2
+
+
+def _train_mlp_loop(X, y, W1, b1, W2, b2, steps, lr, l2):  # pragma: no cover - compiled by numba
+    n, dims = X.shape
+    hidden = W1.shape[0]
+    z1 = np.empty(hidden, dtype=W1.dtype)
+    gW1 = np.empty_like(W1)
+    gb1 = np.empty_like(b1)
+    gW2 = np.empty_like(W2)
+    for _ in range(steps):
+        gW1[:] = 0.0
+        gb1[:] = 0.0
+        gW2[:] = 0.0
+        gb2 = 0.0
+        for k in range(n):
+            logit = b2
+            for j in range(hidden):
+                z = b1[j]
+                for i in range(dims):
+                    z += W1[j, i] * X[k, i]
+                z1[j] = z
+                if z > 0.0:
+                    logit += W2[j] * z
+            if logit < -60.0:
+                logit = -60.0
+            elif logit > 60.0:
+                logit = 60.0
+            d = 1.0 / (1.0 + math.exp(-logit)) - y[k]
+            gb2 += d
+            for j in range(hidden):
+                if z1[j] > 0.0:
+                    gW2[j] += z1[j] * d
+                    dz = d * W2[j]
+                    gb1[j] += dz
+                    for i in range(dims):
+                        gW1[j, i] += dz * X[k, i]
+        for j in range(hidden):
+            for i in range(dims):
+                W1[j, i] -= lr * (gW1[j, i] / n + l2 * W1[j, i])
+            b1[j] -= lr * gb1[j] / n
+            W2[j] -= lr * (gW2[j] / n + l2 * W2[j])
+        b2 -= lr * gb2 / n
+    return b2
+
+
+if njit is not None:
+    train_mlp_kernel = njit(cache=True, fastmath=True)(_train_mlp_loop)
+else:
+    train_mlp_kernel = train_mlp_np
+
+
+def warm_up_train_mlp(dims: int, hidden: int) -> None:
+    """Run train_mlp_kernel once on a dummy batch so JIT compilation happens up front."""
+
+    X = np.zeros((2, dims), dtype=np.float32)
+    y = np.asarray([0.0, 1.0], dtype=np.float32)
+    W1, b1, W2, b2 = init_mlp(dims, hidden, 0)
+    train_mlp_kernel(X, y, W1, b1, W2, b2, 1, 0.1, 0.0)
 
 
 def train_mlp(
@@ -112,125 +221,220 @@ def train_mlp(
     lr: float,
     l2: float,
     seed: int,
+    batch_size: int = 0,
 ) -> tuple[list[list[float]], list[float], list[float], float]:
     n = len(X)
     if n == 0:
         return [], [], [], 0.0
-    dims = len(X[0])
-    rng = random.Random(seed)
+    rng = np.random.default_rng(seed)
+    W1, b1, W2, b2 = init_mlp(len(X[0]), hidden, rng)
+    Xa = np.asarray(X, dtype=np.float32)
+    ya = np.asarray(y, dtype=np.float32)
+    if 0 < batch_size < n:
+        b2 = train_mlp_minibatch(Xa, ya, W1, b1, W2, b2, steps, lr, l2, batch_size, rng)
+    else:
+        b2 = train_mlp_np(Xa, ya, W1, b1, W2, b2, steps, lr, l2)
+    return W1.tolist(), b1.tolist(), W2.tolist(), b2
 
-    def init(scale: float) -> float:
-        return (rng.random() * 2.0 - 1.0) * scale
 
-    W1 = [[init(0.1) for _ in range(dims)] for _ in range(hidden)]
-    b1 = [0.0 for _ in range(hidden)]
-    W2 = [init(0.1) for _ in range(hidden)]
-    b2 = 0.0
+def logreg_prob_np(x: np.ndarray, w: np.ndarray, b: float) -> float:
+    return sigmoid(float(w @ x) + b)
 
-    for _ in range(steps):
-        gW1 = [[0.0 for _ in range(dims)] for _ in range(hidden)]
-        gb1 = [0.0 for _ in range(hidden)]
-        gW2 = [0.0 for _ in range(hidden)]
-        gb2 = 0.0
 
-        for x, label in zip(X, y):
-            z1 = [b1[j] + sum(W1[j][i] * x[i] for i in range(dims)) for j in range(hidden)]
-            h = [relu(v) for v in z1]
-            logit = b2 + sum(W2[j] * h[j] for j in range(hidden))
-            prob = sigmoid(logit)
-            dlogit = prob - float(label)
+def mlp_prob_np(x: np.ndarray, W1: np.ndarray, b1: np.ndarray, W2: np.ndarray, b2: float) -> float:
+    h = np.maximum(W1 @ x + b1, 0.0)
+    return sigmoid(float(h @ W2) + b2)
 
-            for j in range(hidden):
-                gW2[j] += dlogit * h[j]
-            gb2 += dlogit
 
-            for j in range(hidden):
-                if z1[j] <= 0.0:
-                    continue
-                dz1 = dlogit * W2[j]
-                gb1[j] += dz1
-                for i in range(dims):
-                    gW1[j][i] += dz1 * x[i]
+def logreg_probs(X: np.ndarray, w: np.ndarray, b: float) -> np.ndarray:
+    return np_sigmoid(X @ w + b)
 
-        inv_n = 1.0 / max(1, n)
-        for j in range(hidden):
-            for i in range(dims):
-                g = gW1[j][i] * inv_n + l2 * W1[j][i]
-                W1[j][i] -= lr * g
-            gb1[j] *= inv_n
-            b1[j] -= lr * gb1[j]
-        for j in range(hidden):
-            g = gW2[j] * inv_n + l2 * W2[j]
-            W2[j] -= lr * g
-        b2 -= lr * gb2 * inv_n
 
-    return W1, b1, W2, b2
+def mlp_probs(X: np.ndarray, W1: np.ndarray, b1: np.ndarray, W2: np.ndarray, b2: float) -> np.ndarray:
+    H = np.maximum(X @ W1.T + b1, 0.0)
+    return np_sigmoid(H @ W2 + b2)
 
 
-def mlp_prob(W1: list[list[float]], b1: list[float], W2: list[float], b2: float, x: list[float]) -> float:
-    if not W1:
+def _score_logreg(x, w, b):  # pragma: no cover - compiled by numba
+    score = b
+    for i in range(min(x.shape[0], w.shape[0])):
+        score += w[i] * x[i]
+    if score < -60.0:
+        return 0.0
+    if score > 60.0:
+        return 1.0
+    return 1.0 / (1.0 + math.exp(-score))
+
+
+def _score_mlp(x, W1, b1, W2, b2):  # pragma: no cover - compiled by numba
+    logit = b2
+    for j in range(W1.shape[0]):
+        z = b1[j]
+        for i in range(x.shape[0]):
+            z += W1[j, i] * x[i]
+        if z > 0.0:
+            logit += W2[j] * z
+    if logit < -60.0:
         return 0.0
-    hidden = len(W1)
-    dims = len(x)
-    z1 = [b1[j] + sum(W1[j][i] * x[i] for i in range(dims)) for j in range(hidden)]
-    h = [relu(v) for v in z1]
-    logit = b2 + sum(W2[j] * h[j] for j in range(hidden))
-    return sigmoid(logit)
+    if logit > 60.0:
+        return 1.0
+    return 1.0 / (1.0 + math.exp(-logit))
+
+
+if njit is not None:
+    score_logreg = njit(cache=True)(_score_logreg)
+    score_mlp = njit(cache=True)(_score_mlp)
+else:
+    score_logreg = logreg_prob_np
+    score_mlp = mlp_prob_np
 
 
-def evaluate_probs(y: list[int], probs: list[float]) -> tuple[float, float]:
-    if not y:
+def evaluate_probs(y: np.ndarray, probs: np.ndarray) -> tuple[float, float]:
+    if len(y) == 0:
         return 0.0, 0.0
-    correct = 0
-    avg_prob = 0.0
-    for label, prob in zip(y, probs):
-        pred = 1 if prob >= 0.5 else 0
-        if pred == label:
-            correct += 1
-        avg_prob += prob
-    return correct / len(y), avg_prob / len(y)
+    probs = np.asarray(probs)
+    acc = float(((probs >= 0.5).astype(np.int8) == np.asarray(y)).mean())
+    return acc, float(probs.mean())
+
+
+def fold_normalization(
+    weights: list[float],
+    bias: float,
+    mean: list[float] | None,
+    std: list[float] | None,
+) -> tuple[list[float], float]:
+    """Rewrite w.((x - mean) / std) + b as w'.x + b' so scoring can skip normalization."""
+
+    dims = len(features_from_metrics({}, ""))
+    if not mean or not std or not len(weights) == len(mean) == len(std) == dims:
+        return weights, bias
+    folded: list[float] = []
+    for w, m, s in zip(weights, mean, std):
+        if s > 0:
+            w = w / s
+            bias -= w * m
+        folded.append(w)
+    return folded, bias
 
 
-@dataclass(frozen=True)
 class Controller:
-    kind: str
-    accept_prob: float
-    margin_threshold: float
-    mean: list[float] | None = None
-    std: list[float] | None = None
-    weights: list[float] | None = None
-    bias: float = 0.0
-    W1: list[list[float]] | None = None
-    b1: list[float] | None = None
-    W2: list[float] | None = None
-    b2: float = 0.0
+    __slots__ = (
+        "kind",
+        "accept_prob",
+        "margin_threshold",
+        "mean",
+        "std",
+        "weights",
+        "bias",
+        "W1",
+        "b1",
+        "W2",
+        "b2",
+        "_arrays",
+        "_xbuf",
+    )
+
+    def __init__(
+        self,
+        kind: str,
+        accept_prob: float,
+        margin_threshold: float,
+        mean: list[float] | None = None,
+        std: list[float] | None = None,
+        weights: list[float] | None = None,
+        bias: float = 0.0,
+        W1: list[list[float]] | None = None,
+        b1: list[float] | None = None,
+        W2: list[float] | None = None,
+        b2: float = 0.0,
+    ) -> None:
+        self.kind = kind
+        self.accept_prob = accept_prob
+        self.margin_threshold = margin_threshold
+        self.mean = mean
+        self.std = std
+        self.weights = weights
+        self.bias = bias
+        self.W1 = W1
+        self.b1 = b1
+        self.W2 = W2
+        self.b2 = b2
+        self._arrays: tuple | None = None
+        self._xbuf: np.ndarray | None = None
+        if kind not in ("logreg", "mlp"):
+            return
+        # Scoring runs on contiguous float64 arrays with any normalization folded into the weights,
+        # plus a feature buffer that accept() refills in place.
+        if kind == "logreg":
+            w, b = fold_normalization(weights or [], bias, mean, std)
+            self._arrays = (np.asarray(w, dtype=np.float64), float(b))
+        else:
+            rows: list[list[float]] = []
+            biases: list[float] = []
+            for row, bias_j in zip(W1 or [], b1 or []):
+                row_out, bias_out = fold_normalization(row, bias_j, mean, std)
+                rows.append(row_out)
+                biases.append(bias_out)
+            self._arrays = (
+                np.asarray(rows, dtype=np.float64).reshape(len(rows), -1),
+                np.asarray(biases, dtype=np.float64),
+                np.asarray(W2 or [], dtype=np.float64),
+                float(b2),
+            )
+        self._xbuf = np.empty(len(features_from_metrics({}, "")), dtype=np.float64)
 
     def accept(self, metrics: dict[str, float], token: str) -> tuple[bool, float]:
         if self.kind == "threshold":
             margin = float(metrics.get("margin", 0.0))
             return margin >= self.margin_threshold, margin
 
-        x = features_from_metrics(metrics, token)
-        if self.mean and self.std and len(self.mean) == len(x) == len(self.std):
-            x = [(v - m) / s if s > 0 else v for v, m, s in zip(x, self.mean, self.std)]
-
-        if self.kind == "logreg":
-            w = self.weights or []
-            prob = logreg_prob(w, self.bias, x)
-            return prob >= self.accept_prob, prob
-
-        if self.kind == "mlp":
-            prob = mlp_prob(self.W1 or [], self.b1 or [], self.W2 or [], self.b2, x)
+        if self._arrays is not None and self._xbuf is not None:
+            x = self._xbuf
+            x[0] = float(metrics.get("margin", 0.0))
+            x[1] = float(metrics.get("max", 0.0))
+            x[2] = float(metrics.get("second", 0.0))
+            x[3] = float(len(token))
+            if self.kind == "logreg":
+                prob = float(score_logreg(x, *self._arrays))
+            else:
+                prob = float(score_mlp(x, *self._arrays))
             return prob >= self.accept_prob, prob
 
         margin = float(metrics.get("margin", 0.0))
         return margin >= self.margin_threshold, margin
 
+    def accept_many(self, X: np.ndarray) -> np.ndarray:
+        # Batch form of accept() over a (rows, features) matrix from features_from_row.
+        X = np.asarray(X, dtype=np.float64)
+        if self.kind not in ("logreg", "mlp") or self._arrays is None:
+            return X[:, 0] >= self.margin_threshold
+        if self.kind == "logreg":
+            w, b = self._arrays
+            prob = np_sigmoid(X @ w + b)
+        else:
+            W1, b1, W2, b2 = self._arrays
+            prob = np_sigmoid(np.maximum(X @ W1.T + b1, 0.0) @ W2 + b2)
+        return prob >= self.accept_prob
+
 
 def load_controller(path: Path, *, accept_prob: float, margin_threshold: float) -> Controller:
     if not path.exists():
         return Controller(kind="threshold", accept_prob=accept_prob, margin_threshold=margin_threshold)
+    data = load_weights_payload(path)
+    return controller_from_payload(data, accept_prob=accept_prob, margin_threshold=margin_threshold)
+
+
+def load_weights_payload(path: Path) -> dict:
     data = json.loads(path.read_text(encoding="utf-8"))
+    # neuroutine_train.py writes a scalar-only manifest that names an .npz holding the arrays.
+    arrays = data.get("arrays")
+    if isinstance(arrays, str):
+        with np.load(path.parent / arrays) as npz:
+            data.update({key: npz[key].tolist() for key in npz.files})
+    return data
+
+
+def controller_from_payload(data: dict, *, accept_prob: float, margin_threshold: float) -> Controller:
     kind = str(data.get("type") or "").strip().lower()
     mean = data.get("mean")
     std = data.get("std")
@@ -250,14 +454,18 @@ def load_controller(path: Path, *, accept_prob: float, margin_threshold: float)
             and b1
             and W2
         ):
+            W1_out: list[list[float]] = []
+            b1_out: list[float] = []
+            for row, bias_j in zip(W1, b1):
+                row_out, bias_out = fold_normalization([float(v) for v in row], float(bias_j), mean_out, std_out)
+                W1_out.append(row_out)
+                b1_out.append(bias_out)
             return Controller(
                 kind="mlp",
                 accept_prob=accept_prob,
                 margin_threshold=margin_threshold,
-                mean=mean_out,
-                std=std_out,
-                W1=[[float(v) for v in row] for row in W1],
-                b1=[float(v) for v in b1],
+                W1=W1_out,
+                b1=b1_out,
                 W2=[float(v) for v in W2],
                 b2=b2,
             )
@@ -269,12 +477,11 @@ def load_controller(path: Path, *, accept_prob: float, margin_threshold: float)
         weights_out = [float(w) for w in weights]
         if weights_out and max(abs(w) for w in weights_out) < 1e-6 and abs(bias) > 2.0:
             return Controller(kind="threshold", accept_prob=accept_prob, margin_threshold=margin_threshold)
+        weights_out, bias = fold_normalization(weights_out, bias, mean_out, std_out)
         return Controller(
             kind="logreg",
             accept_prob=accept_prob,
             margin_threshold=margin_threshold,
-            mean=mean_out,
-            std=std_out,
             weights=weights_out,
             bias=bias,
         )
@@ -1,143 +1,13 @@
 #!/usr/bin/env python3
 import argparse
-import subprocess
-import sys
-import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import BinaryIO
 
+from _runner import Runners, start_runners, stop_runners, timed_send
 from neuroutine_controller import load_controller
 
 
-RS = b"\x1e"
-METRICS_PREFIX = b"NR|"
-
-
-def repo_root() -> Path:
-    return Path(__file__).resolve().parents[1]
-
-
-def resolve_runner(root: Path, override: str | None) -> str:
-    if override:
-        return override
-    candidates = [
-        root / "bin" / "noxlocal",
-        root / "noxpy" / "localrunner" / "noxlocal",
-        root.parent / "noxpy" / "localrunner" / "noxlocal",
-    ]
-    for candidate in candidates:
-        if candidate.exists():
-            return str(candidate)
-    return "noxlocal"
-
-
-def read_until_rs(proc: subprocess.Popen) -> str:
-    out = bytearray()
-    stream = proc.stdout
-    if stream is None:
-        return ""
-    while True:
-        ch = stream.read(1)
-        if ch == b"" or ch == RS:
-            break
-        out.extend(ch)
-    return out.decode("utf-8", errors="replace")
-
-
-def send_prompt(proc: subprocess.Popen, prompt: str) -> str:
-    stdin = proc.stdin
-    if stdin is None:
-        raise RuntimeError("stdin unavailable")
-    stdin.write(prompt.encode("utf-8") + RS)
-    stdin.flush()
-    return read_until_rs(proc)
-
-
-class MetricsReader(threading.Thread):
-    def __init__(self, stream: BinaryIO | None, verbose: bool) -> None:
-        super().__init__(daemon=True)
-        self.stream = stream
-        self.verbose = verbose
-        self.queue: list[dict[str, float]] = []
-        self.cv = threading.Condition()
-
-    def run(self) -> None:
-        if self.stream is None:
-            return
-        for line in iter(self.stream.readline, b""):
-            if line.startswith(METRICS_PREFIX):
-                parsed = parse_metrics(line)
-                if parsed is not None:
-                    with self.cv:
-                        self.queue.append(parsed)
-                        self.cv.notify()
-            elif self.verbose:
-                sys.stderr.buffer.write(line)
-                sys.stderr.buffer.flush()
-
-    def get(self, timeout: float) -> dict[str, float] | None:
-        end = time.time() + timeout
-        with self.cv:
-            while not self.queue:
-                remaining = end - time.time()
-                if remaining <= 0:
-                    return None
-                self.cv.wait(timeout=remaining)
-            return self.queue.pop(0)
-
-
-def parse_metrics(line: bytes) -> dict[str, float] | None:
-    try:
-        text = line.decode("utf-8", errors="replace").strip()
-        parts = text.split("|")
-        if len(parts) < 5:
-            return None
-        return {
-            "token": float(parts[1]),
-            "max": float(parts[2]),
-            "second": float(parts[3]),
-            "margin": float(parts[4]),
-        }
-    except ValueError:
-        return None
-
-def start_runner(
-    runner: str,
-    model: str,
-    ctx: int,
-    batch: int,
-    fast: bool,
-    metrics: bool,
-) -> subprocess.Popen:
-    cmd = [
-        runner,
-        "-serve",
-        "-serve-rs",
-        "-raw",
-        "-keep-cache",
-        "-max-tokens",
-        "1",
-        "-ctx",
-        str(ctx),
-        "-batch",
-        str(batch),
-        "-model",
-        model,
-    ]
-    if fast:
-        cmd.append("-fast")
-    if metrics:
-        cmd.append("-metrics")
-    return subprocess.Popen(
-        cmd,
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        bufsize=0,
-    )
-
-
 def load_prompts(args: argparse.Namespace) -> list[str]:
     if args.prompt:
         return [args.prompt]
@@ -150,7 +20,7 @@ def load_prompts(args: argparse.Namespace) -> list[str]:
     return ["hello"]
 
 
-def main() -> int:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Evaluate neuroutine gate accuracy + fallback rate.")
     parser.add_argument("--runner", default=None, help="Path to noxlocal binary")
     parser.add_argument("--model-small", default=None, help="Path to small GGUF model")
@@ -165,16 +35,22 @@ def main() -> int:
     parser.add_argument("--prompt", default=None, help="Single prompt")
     parser.add_argument("--prompts", default=None, help="File with prompts (one per line)")
     parser.add_argument("--metrics-timeout", type=float, default=2.0, help="Seconds to wait for metrics")
+    parser.add_argument(
+        "--sequential",
+        action="store_true",
+        help="Query the small then the large model, so per-model times are uncontended",
+    )
     parser.add_argument("--verbose", action="store_true", help="Echo runner stderr")
-    args = parser.parse_args()
+    return parser.parse_args(argv)
 
-    root = repo_root()
-    runner = resolve_runner(root, args.runner)
-    tiny_default = root / "assets" / "models" / "tinyllama.gguf"
-    model_small = args.model_small or (
-        str(tiny_default) if tiny_default.exists() else str(root / "assets" / "models" / "nox.gguf")
-    )
-    model_large = args.model_large or str(root / "assets" / "models" / "mistral-7b-q4.gguf")
+
+def run(args: argparse.Namespace, runners: Runners | None = None) -> int:
+    # Callers may pass already-running runners (see neuroutine_one.py); those are left running.
+    owned = runners is None
+    if runners is None:
+        runners = start_runners(args)
+    small_proc, large_proc, metrics_reader = runners
+    metrics_reader.drain()
 
     weights_path = Path(args.weights) if args.weights else Path("__missing__")
     controller = load_controller(
@@ -183,13 +59,6 @@ def main() -> int:
         margin_threshold=args.margin_threshold,
     )
 
-    fast = not args.no_fast
-    small_proc = start_runner(runner, model_small, args.ctx, args.batch, fast, metrics=True)
-    large_proc = start_runner(runner, model_large, args.ctx, args.batch, fast, metrics=False)
-
-    metrics_reader = MetricsReader(small_proc.stderr, args.verbose)
-    metrics_reader.start()
-
     prompts = load_prompts(args)
     total = 0
     accepted = 0
@@ -197,38 +66,42 @@ def main() -> int:
     small_time = 0.0
     large_time = 0.0
 
-    for prompt in prompts:
-        current = prompt
-        for _ in range(args.steps):
-            start = time.perf_counter()
-            draft = send_prompt(small_proc, current)
-            small_time += time.perf_counter() - start
-
-            metrics = metrics_reader.get(args.metrics_timeout) or {}
-            accept, _score = controller.accept(metrics, draft)
-
-            start = time.perf_counter()
-            verify = send_prompt(large_proc, current)
-            large_time += time.perf_counter() - start
-
-            total += 1
-            if accept:
-                accepted += 1
-                if draft != verify:
-                    wrong_accept += 1
-
-            if not verify:
-                break
-            current += verify
-
-    for proc in (small_proc, large_proc):
-        try:
-            if proc.stdin:
-                proc.stdin.write(b"exit" + RS)
-                proc.stdin.flush()
-        except Exception:
-            pass
-        proc.terminate()
+    # The two runners are independent processes, so each step dispatches both at once and
+    # waits roughly max(small, large) instead of their sum. They then compete for cores and
+    # memory bandwidth, which inflates both per-model times; --sequential avoids that.
+    wall_start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        for prompt in prompts:
+            # The runner needs the full context each step (-keep-cache reuses the matching KV
+            # prefix), so keep it pre-encoded and append instead of rebuilding a str per token.
+            current = bytearray(prompt.encode("utf-8"))
+            for _ in range(args.steps):
+                small_future = pool.submit(timed_send, small_proc, current)
+                if args.sequential:
+                    small_future.result()
+                large_future = pool.submit(timed_send, large_proc, current)
+                draft, small_dt = small_future.result()
+                small_time += small_dt
+
+                metrics = metrics_reader.get(args.metrics_timeout) or {}
+                accept, _score = controller.accept(metrics, draft)
+
+                verify, large_dt = large_future.result()
+                large_time += large_dt
+
+                total += 1
+                if accept:
+                    accepted += 1
+                    if draft != verify:
+                        wrong_accept += 1
+
+                if not verify:
+                    break
+                current += verify.encode("utf-8")
+    wall_time = time.perf_counter() - wall_start
+
+    if owned:
+        stop_runners(runners)
 
     if total == 0:
         print("no samples")
@@ -239,9 +112,15 @@ def main() -> int:
     print(f"samples={total}")
     print(f"accept_rate={accept_rate:.3f}")
     print(f"wrong_accept_rate={wrong_rate:.3f}")
-    print(f"small_time_s={small_time:.2f} large_time_s={large_time:.2f}")
+    timing = "sequential" if args.sequential else "concurrent"
+    print(f"small_time_s={small_time:.2f} large_time_s={large_time:.2f} ({timing})")
+    print(f"wall_time_s={wall_time:.2f}")
     return 0
 
 
+def main() -> int:
+    return run(parse_args())
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -1,146 +1,12 @@
 #!/usr/bin/env python3
 import argparse
-import json
-import subprocess
-import sys
-import threading
 import time
-from collections import deque
 from pathlib import Path
-from typing import BinaryIO
 
+from _runner import Runners, send_prompt, start_runners, stop_runners
 from neuroutine_controller import load_controller
 
 
-RS = b"\x1e"
-METRICS_PREFIX = b"NR|"
-
-
-def repo_root() -> Path:
-    return Path(__file__).resolve().parents[1]
-
-
-def resolve_runner(root: Path, override: str | None) -> str:
-    if override:
-        return override
-    candidates = [
-        root / "bin" / "noxlocal",
-        root / "noxpy" / "localrunner" / "noxlocal",
-        root.parent / "noxpy" / "localrunner" / "noxlocal",
-    ]
-    for candidate in candidates:
-        if candidate.exists():
-            return str(candidate)
-    return "noxlocal"
-
-
-def read_until_rs(proc: subprocess.Popen) -> str:
-    out = bytearray()
-    stream = proc.stdout
-    if stream is None:
-        return ""
-    while True:
-        ch = stream.read(1)
-        if ch == b"" or ch == RS:
-            break
-        out.extend(ch)
-    return out.decode("utf-8", errors="replace")
-
-
-def send_prompt(proc: subprocess.Popen, prompt: str) -> str:
-    stdin = proc.stdin
-    if stdin is None:
-        raise RuntimeError("stdin unavailable")
-    stdin.write(prompt.encode("utf-8") + RS)
-    stdin.flush()
-    return read_until_rs(proc)
-
-
-class MetricsReader(threading.Thread):
-    def __init__(self, stream: BinaryIO | None, verbose: bool) -> None:
-        super().__init__(daemon=True)
-        self.stream = stream
-        self.verbose = verbose
-        self.queue: deque[dict[str, float]] = deque()
-        self.cv = threading.Condition()
-
-    def run(self) -> None:
-        if self.stream is None:
-            return
-        for line in iter(self.stream.readline, b""):
-            if line.startswith(METRICS_PREFIX):
-                parsed = parse_metrics(line)
-                if parsed is not None:
-                    with self.cv:
-                        self.queue.append(parsed)
-                        self.cv.notify()
-            elif self.verbose:
-                sys.stderr.buffer.write(line)
-                sys.stderr.buffer.flush()
-
-    def get(self, timeout: float) -> dict[str, float] | None:
-        end = time.time() + timeout
-        with self.cv:
-            while not self.queue:
-                remaining = end - time.time()
-                if remaining <= 0:
-                    return None
-                self.cv.wait(timeout=remaining)
-            return self.queue.popleft()
-
-
-def parse_metrics(line: bytes) -> dict[str, float] | None:
-    try:
-        text = line.decode("utf-8", errors="replace").strip()
-        parts = text.split("|")
-        if len(parts) < 5:
-            return None
-        return {
-            "token": float(parts[1]),
-            "max": float(parts[2]),
-            "second": float(parts[3]),
-            "margin": float(parts[4]),
-        }
-    except ValueError:
-        return None
-
-
-def start_runner(
-    runner: str,
-    model: str,
-    ctx: int,
-    batch: int,
-    fast: bool,
-    metrics: bool,
-) -> subprocess.Popen:
-    cmd = [
-        runner,
-        "-serve",
-        "-serve-rs",
-        "-raw",
-        "-keep-cache",
-        "-max-tokens",
-        "1",
-        "-ctx",
-        str(ctx),
-        "-batch",
-        str(batch),
-        "-model",
-        model,
-    ]
-    if fast:
-        cmd.append("-fast")
-    if metrics:
-        cmd.append("-metrics")
-    return subprocess.Popen(
-        cmd,
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        bufsize=0,
-    )
-
-
 def load_prompts(args: argparse.Namespace) -> list[str]:
     if args.prompt:
         return [args.prompt]
@@ -153,7 +19,7 @@ def load_prompts(args: argparse.Namespace) -> list[str]:
     return ["hello"]
 
 
-def main() -> int:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Neuroutine gate: small model drafts, controller decides fallback.")
     parser.add_argument("--runner", default=None, help="Path to noxlocal binary")
     parser.add_argument("--model-small", default=None, help="Path to small GGUF model")
@@ -169,15 +35,16 @@ def main() -> int:
     parser.add_argument("--prompt", default=None, help="Initial prompt")
     parser.add_argument("--prompts", default=None, help="File with prompts (one per line)")
     parser.add_argument("--verbose", action="store_true", help="Echo runner stderr")
-    args = parser.parse_args()
+    return parser.parse_args(argv)
 
-    root = repo_root()
-    runner = resolve_runner(root, args.runner)
-    tiny_default = root / "assets" / "models" / "tinyllama.gguf"
-    model_small = args.model_small or (
-        str(tiny_default) if tiny_default.exists() else str(root / "assets" / "models" / "nox.gguf")
-    )
-    model_large = args.model_large or str(root / "assets" / "models" / "mistral-7b-q4.gguf")
+
+def run(args: argparse.Namespace, runners: Runners | None = None) -> int:
+    # Callers may pass already-running runners (see neuroutine_one.py); those are left running.
+    owned = runners is None
+    if runners is None:
+        runners = start_runners(args)
+    small_proc, large_proc, metrics_reader = runners
+    metrics_reader.drain()
 
     weights_path = Path(args.weights) if args.weights else Path("__missing__")
     controller = load_controller(
@@ -186,13 +53,6 @@ def main() -> int:
         margin_threshold=args.margin_threshold,
     )
 
-    fast = not args.no_fast
-    small_proc = start_runner(runner, model_small, args.ctx, args.batch, fast, metrics=True)
-    large_proc = start_runner(runner, model_large, args.ctx, args.batch, fast, metrics=False)
-
-    metrics_reader = MetricsReader(small_proc.stderr, args.verbose)
-    metrics_reader.start()
-
     prompts = load_prompts(args)
     for prompt in prompts:
         current = prompt
@@ -223,16 +83,14 @@ def main() -> int:
                 break
             current += chosen
 
-    for proc in (small_proc, large_proc):
-        try:
-            if proc.stdin:
-                proc.stdin.write(b"exit" + RS)
-                proc.stdin.flush()
-        except Exception:
-            pass
-        proc.terminate()
+    if owned:
+        stop_runners(runners)
     return 0
 
 
+def main() -> int:
+    return run(parse_args())
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
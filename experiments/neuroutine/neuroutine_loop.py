@@ -1,20 +1,44 @@
 #!/usr/bin/env python3
 import argparse
 import json
-import random
+import operator
+import os
+import selectors
 import subprocess
 import sys
-import threading
 import time
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import BinaryIO
 
-from neuroutine_controller import Controller, compute_norm, features_from_row, load_controller, normalize, train_logreg, train_mlp
+import numpy as np
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
+
+from neuroutine_controller import (
+    controller_from_payload,
+    features_from_row,
+    init_mlp,
+    load_controller,
+    train_logreg,
+    train_mlp_kernel,
+    warm_up_train_mlp,
+)
 
 
 RS = b"\x1e"
 METRICS_PREFIX = b"NR|"
+READ_CHUNK = 65536
+FLUSH_EVERY = 16
+TEACHER_COIN_BLOCK = 4096
+NFEAT = len(features_from_row({}))
+FEATURE_KEYS = ("margin", "max", "second")
+
+_metric_features = operator.itemgetter(*FEATURE_KEYS)
 
 
 def repo_root() -> Path:
@@ -35,77 +59,163 @@ def resolve_runner(root: Path, override: str | None) -> str:
     return "noxlocal"
 
 
+class _PipeReader:
+    def __init__(self, stream: BinaryIO) -> None:
+        self.stream = stream
+        self.buf = bytearray()
+
+    def read_until(self, sep: bytes) -> bytes | None:
+        # Block reads plus a memchr-backed find() instead of one read(1) call per byte.
+        start = 0
+        while True:
+            idx = self.buf.find(sep, start)
+            if idx >= 0:
+                out = bytes(self.buf[:idx])
+                del self.buf[: idx + len(sep)]
+                return out
+            start = max(0, len(self.buf) - len(sep) + 1)
+            chunk = self.stream.read1(READ_CHUNK)
+            if not chunk:
+                if not self.buf:
+                    return None
+                out = bytes(self.buf)
+                self.buf.clear()
+                return out
+            self.buf.extend(chunk)
+
+
+_stdout_readers: dict[subprocess.Popen, _PipeReader] = {}
+
+
 def read_until_rs(proc: subprocess.Popen) -> str:
-    out = bytearray()
     stream = proc.stdout
     if stream is None:
         return ""
-    while True:
-        ch = stream.read(1)
-        if ch == b"" or ch == RS:
-            break
-        out.extend(ch)
-    return out.decode("utf-8", errors="replace")
+    reader = _stdout_readers.get(proc)
+    if reader is None:
+        reader = _stdout_readers[proc] = _PipeReader(stream)
+    out = reader.read_until(RS)
+    return out.decode("utf-8", errors="replace") if out is not None else ""
 
 
-def send_prompt(proc: subprocess.Popen, prompt: str) -> str:
+def send_prompt(proc: subprocess.Popen, prompt: str | bytes | bytearray) -> str:
     stdin = proc.stdin
     if stdin is None:
         raise RuntimeError("stdin unavailable")
-    stdin.write(prompt.encode("utf-8") + RS)
-    stdin.flush()
+    data = prompt.encode("utf-8") if isinstance(prompt, str) else prompt
+    # Straight to the fd: one writev(2) per prompt, no BufferedWriter and no prompt + RS copy.
+    os.writev(stdin.fileno(), (data, RS))
     return read_until_rs(proc)
 
 
-class MetricsReader(threading.Thread):
-    def __init__(self, stream: BinaryIO | None, verbose: bool) -> None:
-        super().__init__(daemon=True)
-        self.stream = stream
+def timed_send(proc: subprocess.Popen, prompt: str | bytes | bytearray) -> tuple[str, float]:
+    start = time.perf_counter()
+    out = send_prompt(proc, prompt)
+    return out, time.perf_counter() - start
+
+
+class SmallRunnerIO:
+    # Multiplexes the small runner's stdout replies and stderr metrics on the calling thread,
+    # so no reader thread or cross-thread handoff is needed per token.
+    def __init__(self, proc: subprocess.Popen, verbose: bool) -> None:
+        if proc.stdin is None or proc.stdout is None or proc.stderr is None:
+            raise RuntimeError("runner pipes unavailable")
+        self.in_fd = proc.stdin.fileno()
+        self.out_fd = proc.stdout.fileno()
+        self.err_fd = proc.stderr.fileno()
         self.verbose = verbose
-        self.queue: deque[dict[str, float]] = deque()
-        self.cv = threading.Condition()
-
-    def run(self) -> None:
-        if self.stream is None:
-            return
-        for line in iter(self.stream.readline, b""):
-            if line.startswith(METRICS_PREFIX):
-                parsed = parse_metrics(line)
-                if parsed is not None:
-                    with self.cv:
-                        self.queue.append(parsed)
-                        self.cv.notify()
-            elif self.verbose:
-                sys.stderr.buffer.write(line)
-                sys.stderr.buffer.flush()
-
-    def get(self, timeout: float) -> dict[str, float] | None:
-        end = time.time() + timeout
-        with self.cv:
-            while not self.queue:
-                remaining = end - time.time()
-                if remaining <= 0:
-                    return None
-                self.cv.wait(timeout=remaining)
-            return self.queue.popleft()
+        self.selector = selectors.DefaultSelector()
+        self.selector.register(self.out_fd, selectors.EVENT_READ)
+        self.selector.register(self.err_fd, selectors.EVENT_READ)
+        self.out_buf = bytearray()
+        self.err_buf = bytearray()
+        self.out_eof = False
+        self.err_eof = False
+        self.metrics: deque[dict[str, float]] = deque()
+
+    def send(self, prompt: str | bytes | bytearray) -> str:
+        data = prompt.encode("utf-8") if isinstance(prompt, str) else prompt
+        os.writev(self.in_fd, (data, RS))
+        while True:
+            idx = self.out_buf.find(RS)
+            if idx >= 0:
+                out = bytes(self.out_buf[:idx])
+                del self.out_buf[: idx + 1]
+                return out.decode("utf-8", errors="replace")
+            if self.out_eof:
+                out = bytes(self.out_buf)
+                self.out_buf.clear()
+                return out.decode("utf-8", errors="replace")
+            self.pump(None)
+
+    def get_metrics(self, timeout: float) -> dict[str, float] | None:
+        end = time.monotonic() + timeout
+        while not self.metrics:
+            remaining = end - time.monotonic()
+            if remaining <= 0 or self.err_eof:
+                return None
+            self.pump(remaining)
+        return self.metrics.popleft()
+
+    def pump(self, timeout: float | None) -> None:
+        for key, _ in self.selector.select(timeout):
+            chunk = os.read(key.fd, READ_CHUNK)
+            if key.fd == self.out_fd:
+                if not chunk:
+                    self.out_eof = True
+                    self.selector.unregister(key.fd)
+                self.out_buf.extend(chunk)
+                continue
+            if not chunk:
+                self.err_eof = True
+                self.selector.unregister(key.fd)
+                if self.err_buf:
+                    self.handle_line(bytes(self.err_buf))
+                    self.err_buf.clear()
+                continue
+            self.err_buf.extend(chunk)
+            start = 0
+            while True:
+                nl = self.err_buf.find(b"\n", start)
+                if nl < 0:
+                    break
+                self.handle_line(bytes(self.err_buf[start:nl]))
+                start = nl + 1
+            del self.err_buf[:start]
+
+    def handle_line(self, line: bytes) -> None:
+        if line.startswith(METRICS_PREFIX):
+            parsed = parse_metrics(line)
+            if parsed is not None:
+                self.metrics.append(parsed)
+        elif self.verbose:
+            sys.stderr.buffer.write(line + b"\n")
+            sys.stderr.buffer.flush()
 
 
 def parse_metrics(line: bytes) -> dict[str, float] | None:
+    # NR|token|max|second|margin -- float() parses ASCII bytes (and strips whitespace) directly.
     try:
-        text = line.decode("utf-8", errors="replace").strip()
-        parts = text.split("|")
-        if len(parts) < 5:
-            return None
+        i1 = line.index(b"|", len(METRICS_PREFIX))
+        i2 = line.index(b"|", i1 + 1)
+        i3 = line.index(b"|", i2 + 1)
+        i4 = line.find(b"|", i3 + 1)
         return {
-            "token": float(parts[1]),
-            "max": float(parts[2]),
-            "second": float(parts[3]),
-            "margin": float(parts[4]),
+            "token": float(line[len(METRICS_PREFIX) : i1]),
+            "max": float(line[i1 + 1 : i2]),
+            "second": float(line[i2 + 1 : i3]),
+            "margin": float(line[i3 + 1 : i4] if i4 >= 0 else line[i3 + 1 :]),
         }
     except ValueError:
         return None
 
 
+def dump_row(row: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(row) + b"\n"
+    return (json.dumps(row, ensure_ascii=True) + "\n").encode("utf-8")
+
+
 def start_runner(
     runner: str,
     model: str,
@@ -138,33 +248,17 @@ def start_runner(
         stdin=subprocess.PIPE,
         stdout=subprocess.PIPE,
         stderr=subprocess.PIPE,
-        bufsize=0,
+        bufsize=-1,
     )
 
 
-def stats_from_rows(rows: list[dict], controller: Controller) -> dict[str, float]:
-    total = 0
-    accepted = 0
-    wrong_accept = 0
-    agreement = 0
-    decision_correct = 0
-    for row in rows:
-        metrics = row.get("metrics") or {}
-        draft = row.get("draft", "")
-        verify = row.get("verify", "")
-        accept, _ = controller.accept(metrics, draft)
-        match = draft == verify and draft != ""
-        total += 1
-        if match:
-            agreement += 1
-        if accept:
-            accepted += 1
-            if not match:
-                wrong_accept += 1
-            else:
-                decision_correct += 1
-        elif not match:
-            decision_correct += 1
+def stats_from_decisions(accepts: np.ndarray, matches: np.ndarray) -> dict[str, float]:
+    # accepts/matches are parallel 0/1 int8 columns, one entry per labeled sample.
+    total = int(accepts.shape[0])
+    accepted = int(np.count_nonzero(accepts))
+    agreement = int(np.count_nonzero(matches))
+    wrong_accept = int(np.count_nonzero(accepts & (matches ^ 1)))
+    decision_correct = int(np.count_nonzero(accepts == matches))
     accept_rate = accepted / total if total else 0.0
     wrong_rate = wrong_accept / accepted if accepted else 0.0
     agreement_rate = agreement / total if total else 0.0
@@ -180,6 +274,20 @@ def stats_from_rows(rows: list[dict], controller: Controller) -> dict[str, float
     }
 
 
+def feature_matrix(rows: list[dict]) -> np.ndarray:
+    # Same layout as features_from_row: the metric fields come out in one itemgetter call and
+    # token_len is already stored on the row. Rows with missing metrics take the slow path.
+    X = np.empty((len(rows), NFEAT), dtype=np.float32)
+    for i, row in enumerate(rows):
+        try:
+            X[i, :3] = _metric_features(row["metrics"])
+        except KeyError:
+            X[i] = features_from_row(row)
+            continue
+        X[i, 3] = row["token_len"]
+    return X
+
+
 def load_prompts(args: argparse.Namespace) -> list[str]:
     if args.prompt:
         return [args.prompt]
@@ -269,10 +377,7 @@ def main() -> int:
     args = parser.parse_args()
 
     root = repo_root()
-    if args.seed:
-        random.seed(args.seed)
-    else:
-        random.seed(time.time_ns())
+    teacher_rng = np.random.default_rng(args.seed or time.time_ns())
     weights_path = (root / args.weights).resolve()
     log_path = (root / args.log).resolve()
     log_path.parent.mkdir(parents=True, exist_ok=True)
@@ -288,55 +393,85 @@ def main() -> int:
     small_proc = start_runner(runner, model_small, args.ctx, args.batch, fast, metrics=True)
     large_proc = start_runner(runner, model_large, args.ctx, args.batch, fast, metrics=False)
 
-    metrics_reader = MetricsReader(small_proc.stderr, args.verbose)
-    metrics_reader.start()
+    small_io = SmallRunnerIO(small_proc, args.verbose)
+
+    if args.controller == "mlp":
+        warm_up_train_mlp(NFEAT, max(1, args.mlp_hidden))
 
     controller = load_controller(weights_path, accept_prob=args.accept_prob, margin_threshold=args.margin_threshold)
 
     train_window: deque[dict] = deque(maxlen=args.window_size)
+    positive_count = 0
+    # Decision-time (accept, match) for each labeled sample, as a ring buffer alongside train_window.
+    window_cap = max(1, args.window_size)
+    window_accepts = np.zeros(window_cap, dtype=np.int8)
+    window_matches = np.zeros(window_cap, dtype=np.int8)
+    window_pos = 0
+    window_len = 0
     prompts = load_prompts(args)
     prompt_idx = 0
     total_tokens = 0
     labeled_samples = 0
     last_report: dict[str, float] | None = None
     gate_correct = 0
-    gate_window: deque[int] = deque(maxlen=max(1, args.accuracy_window))
-    small_time_s = 0.0
+    # Rolling gate accuracy as a uint8 ring with a running sum: O(1) per token.
+    gate_cap = max(1, args.accuracy_window)
+    gate_ring = np.zeros(gate_cap, dtype=np.uint8)
+    gate_pos = 0
+    gate_len = 0
+    gate_sum = 0
     large_time_s = 0.0
+    # Wall-clock time spent on model calls; less than small+large when mirror overlaps them.
+    spent_time_s = 0.0
     large_calls = 0
 
-    with log_path.open("a", encoding="utf-8") as handle:
+    pending_flush = 0
+    teacher_coins = np.empty(0, dtype=bool)
+    teacher_idx = 0
+
+    with (
+        log_path.open("ab") as handle,
+        ThreadPoolExecutor(max_workers=1) as pool,
+        ThreadPoolExecutor(max_workers=1) as weights_writer,
+    ):
         try:
             while True:
                 if prompt_idx >= len(prompts):
                     prompt_idx = 0
-                current = prompts[prompt_idx]
+                prompt = prompts[prompt_idx]
                 prompt_idx += 1
 
-                print(f"prompt: {current!r}")
+                print(f"prompt: {prompt!r}")
+                # The runner needs the full context each step (-keep-cache reuses the matching KV
+                # prefix), so keep it pre-encoded and append instead of rebuilding a str per token.
+                current = bytearray(prompt.encode("utf-8"))
+                current_len = len(prompt)
                 for step in range(1, args.steps + 1):
+                    # Mirror mode always needs the large token, so overlap it with the small call.
+                    step_start = time.perf_counter()
+                    large_future = pool.submit(timed_send, large_proc, current) if args.mirror else None
                     start = time.perf_counter()
-                    draft = send_prompt(small_proc, current)
+                    draft = small_io.send(current)
                     small_dt = time.perf_counter() - start
-                    small_time_s += small_dt
-                    metrics = metrics_reader.get(args.metrics_timeout) or {}
+                    metrics = small_io.get_metrics(args.metrics_timeout) or {}
                     accept, score = controller.accept(metrics, draft)
 
                     should_call_teacher = args.mirror or (not accept)
                     if not should_call_teacher and args.teacher_every > 0:
                         if (total_tokens + 1) % args.teacher_every == 0:
                             should_call_teacher = True
-                    if (
-                        not should_call_teacher
-                        and args.teacher_prob > 0.0
-                        and random.random() < args.teacher_prob
-                    ):
-                        should_call_teacher = True
+                    if not should_call_teacher and args.teacher_prob > 0.0:
+                        # Coins are drawn in blocks; one vectorized draw covers thousands of tokens.
+                        if teacher_idx >= len(teacher_coins):
+                            teacher_coins = teacher_rng.random(TEACHER_COIN_BLOCK) < args.teacher_prob
+                            teacher_idx = 0
+                        should_call_teacher = bool(teacher_coins[teacher_idx])
+                        teacher_idx += 1
                     if (
                         not should_call_teacher
                         and accept
                         and args.bootstrap_positives > 0
-                        and sum(1 for r in train_window if r.get("label") == 1) < args.bootstrap_positives
+                        and positive_count < args.bootstrap_positives
                     ):
                         should_call_teacher = True
 
@@ -345,17 +480,25 @@ def main() -> int:
                     large_dt = 0.0
                     match = False
                     if should_call_teacher:
-                        start = time.perf_counter()
-                        verify = send_prompt(large_proc, current)
-                        large_dt = time.perf_counter() - start
+                        if large_future is not None:
+                            verify, large_dt = large_future.result()
+                        else:
+                            verify, large_dt = timed_send(large_proc, current)
                         large_time_s += large_dt
                         large_calls += 1
                         match = draft == verify and draft != ""
                         label = int(match)
                         labeled_samples += 1
+                        if train_window and len(train_window) == train_window.maxlen:
+                            positive_count -= train_window[0].get("label") or 0
+                        positive_count += label
+                        window_accepts[window_pos] = accept
+                        window_matches[window_pos] = label
+                        window_pos = (window_pos + 1) % window_cap
+                        window_len = min(window_len + 1, window_cap)
                         train_window.append(
                             {
-                                "prompt_len": len(current),
+                                "prompt_len": current_len,
                                 "step": step,
                                 "draft": draft,
                                 "verify": verify,
@@ -364,9 +507,17 @@ def main() -> int:
                                 "token_len": len(draft),
                             }
                         )
-                        decision_correct = (accept and match) or ((not accept) and (not match))
-                        gate_correct += 1 if decision_correct else 0
-                        gate_window.append(1 if decision_correct else 0)
+                        decision_correct = int(accept == match)
+                        gate_correct += decision_correct
+                        gate_sum += decision_correct - int(gate_ring[gate_pos])
+                        gate_ring[gate_pos] = decision_correct
+                        gate_pos = (gate_pos + 1) % gate_cap
+                        gate_len = min(gate_len + 1, gate_cap)
+
+                    if large_future is not None:
+                        spent_time_s += time.perf_counter() - step_start
+                    else:
+                        spent_time_s += small_dt + large_dt
 
                     if args.mirror:
                         chosen = verify or ""
@@ -381,7 +532,7 @@ def main() -> int:
                     )
 
                     row = {
-                        "prompt_len": len(current),
+                        "prompt_len": current_len,
                         "step": step,
                         "draft": draft,
                         "verify": verify,
@@ -395,12 +546,16 @@ def main() -> int:
                         "large_time_s": large_dt,
                         "chosen": chosen,
                     }
-                    handle.write(json.dumps(row, ensure_ascii=True) + "\n")
-                    handle.flush()
+                    handle.write(dump_row(row))
+                    pending_flush += 1
+                    # Flush in batches, but always after a teacher call so labeled rows reach disk promptly.
+                    if pending_flush >= FLUSH_EVERY or should_call_teacher:
+                        handle.flush()
+                        pending_flush = 0
                     total_tokens += 1
 
                     total_acc = gate_correct / labeled_samples if labeled_samples else 0.0
-                    rolling_acc = sum(gate_window) / len(gate_window) if gate_window else 0.0
+                    rolling_acc = gate_sum / gate_len if gate_len else 0.0
                     print(
                         f"{step:02d} {decision} score={score:.3f} "
                         f"draft={draft!r} chosen={chosen!r} "
@@ -411,13 +566,14 @@ def main() -> int:
 
                     if not chosen:
                         break
-                    current += chosen
+                    current += chosen.encode("utf-8")
+                    current_len += len(chosen)
 
                     if args.report_every > 0 and labeled_samples > 0 and labeled_samples % args.report_every == 0:
-                        stats = stats_from_rows(list(train_window), controller)
+                        stats = stats_from_decisions(window_accepts[:window_len], window_matches[:window_len])
                         avg_large = large_time_s / max(1, large_calls)
                         baseline = avg_large * total_tokens
-                        actual = small_time_s + large_time_s
+                        actual = spent_time_s
                         speedup = (baseline / actual) if actual > 0 else 0.0
                         msg = (
                             f"samples={stats['samples']} tokens={total_tokens} large_calls={large_calls} "
@@ -437,15 +593,19 @@ def main() -> int:
                         and len(train_window) >= args.min_samples
                     ):
                         rows = list(train_window)
-                        X = [features_from_row(r) for r in rows]
-                        y = [int(r.get("label", 0)) for r in rows]
-                        pos = sum(y)
-                        neg = len(y) - pos
+                        y = np.fromiter((int(r.get("label", 0)) for r in rows), dtype=np.float32, count=len(rows))
+                        pos = int(y.sum())
+                        neg = len(rows) - pos
                         if pos == 0 or neg == 0:
                             print(f"retrain: skipped (need pos+neg, pos={pos} neg={neg})")
                             continue
-                        mean, std = compute_norm(X)
-                        Xn = normalize(X, mean, std)
+                        X = feature_matrix(rows)
+                        mean_arr = X.mean(axis=0)
+                        std_arr = X.std(axis=0)
+                        std_arr[std_arr < 1e-6] = 1.0
+                        Xn = (X - mean_arr) / std_arr
+                        mean = mean_arr.tolist()
+                        std = std_arr.tolist()
                         payload: dict
                         if args.controller == "logreg":
                             weights, bias = train_logreg(Xn, y, args.train_steps, args.lr, args.l2)
@@ -455,48 +615,35 @@ def main() -> int:
                                 "bias": bias,
                             }
                         else:
-                            W1, b1, W2, b2 = train_mlp(
-                                Xn,
-                                y,
-                                hidden=max(1, args.mlp_hidden),
-                                steps=args.train_steps,
-                                lr=args.lr,
-                                l2=args.l2,
-                                seed=args.train_seed,
-                            )
+                            W1, b1, W2, b2 = init_mlp(NFEAT, max(1, args.mlp_hidden), args.train_seed)
+                            b2 = train_mlp_kernel(Xn, y, W1, b1, W2, b2, args.train_steps, args.lr, args.l2)
                             payload = {
                                 "type": "mlp_v1",
                                 "hidden": max(1, args.mlp_hidden),
-                                "W1": W1,
-                                "b1": b1,
-                                "W2": W2,
-                                "b2": b2,
+                                "W1": W1.tolist(),
+                                "b1": b1.tolist(),
+                                "W2": W2.tolist(),
+                                "b2": float(b2),
                             }
-                        weights_path.write_text(
-                            json.dumps(
-                                {
-                                    **payload,
-                                    "mean": mean,
-                                    "std": std,
-                                    "samples": len(rows),
-                                    "pos": pos,
-                                    "neg": neg,
-                                },
-                                indent=2,
-                                ensure_ascii=True,
-                            )
-                            + "\n",
-                            encoding="utf-8",
-                        )
-                        controller = load_controller(
-                            weights_path,
+                        weights_payload = {
+                            **payload,
+                            "mean": mean,
+                            "std": std,
+                            "samples": len(rows),
+                            "pos": pos,
+                            "neg": neg,
+                        }
+                        # Swap the controller in from memory; the JSON copy is written off the token path.
+                        controller = controller_from_payload(
+                            weights_payload,
                             accept_prob=args.accept_prob,
                             margin_threshold=args.margin_threshold,
                         )
-                        stats = stats_from_rows(rows, controller)
+                        weights_writer.submit(weights_path.write_bytes, dump_row(weights_payload))
+                        stats = stats_from_decisions(controller.accept_many(X).astype(np.int8), y.astype(np.int8))
                         avg_large = large_time_s / max(1, large_calls)
                         baseline = avg_large * total_tokens
-                        actual = small_time_s + large_time_s
+                        actual = spent_time_s
                         speedup = (baseline / actual) if actual > 0 else 0.0
                         if last_report:
                             delta = {
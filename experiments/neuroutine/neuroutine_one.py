@@ -3,6 +3,13 @@ import argparse
 import subprocess
 import sys
 from pathlib import Path
+from typing import Callable
+
+from _runner import start_runners, stop_runners
+import neuroutine_collect
+import neuroutine_eval
+import neuroutine_gate
+import neuroutine_train
 
 
 def repo_root() -> Path:
@@ -31,6 +38,14 @@ def ensure_prompts_file(path: Path) -> Path:
     return path
 
 
+def run_stage(label: str, argv: list[str], stage: Callable[[], int]) -> None:
+    print(f"\n== {label} ==")
+    print(" ".join([f"neuroutine_{label}.py", *argv]))
+    code = stage()
+    if code:
+        raise SystemExit(code)
+
+
 def run_step(label: str, args: list[str]) -> None:
     print(f"\n== {label} ==")
     print(" ".join(args))
@@ -79,9 +94,7 @@ def main() -> int:
 
     py = sys.executable
     exp_dir = root / "experiments" / "neuroutine"
-    collect_cmd = [
-        py,
-        str(exp_dir / "neuroutine_collect.py"),
+    collect_argv = [
         "--steps",
         str(args.steps),
         "--ctx",
@@ -94,30 +107,26 @@ def main() -> int:
         str(args.metrics_timeout),
     ]
     if args.prompt:
-        collect_cmd += ["--prompt", args.prompt]
+        collect_argv += ["--prompt", args.prompt]
     if args.prompts:
-        collect_cmd += ["--prompts", args.prompts]
+        collect_argv += ["--prompts", args.prompts]
     if args.model_small:
-        collect_cmd += ["--model-small", args.model_small]
+        collect_argv += ["--model-small", args.model_small]
     if args.model_large:
-        collect_cmd += ["--model-large", args.model_large]
+        collect_argv += ["--model-large", args.model_large]
     if args.no_fast:
-        collect_cmd.append("--no-fast")
+        collect_argv.append("--no-fast")
     if args.verbose:
-        collect_cmd.append("--verbose")
+        collect_argv.append("--verbose")
 
-    train_cmd = [
-        py,
-        str(exp_dir / "neuroutine_train.py"),
+    train_argv = [
         "--data",
         str(train_path),
         "--out",
         str(weights_path),
     ]
 
-    eval_cmd = [
-        py,
-        str(exp_dir / "neuroutine_eval.py"),
+    eval_argv = [
         "--steps",
         str(args.steps),
         "--ctx",
@@ -130,21 +139,19 @@ def main() -> int:
         str(args.metrics_timeout),
     ]
     if args.prompt:
-        eval_cmd += ["--prompt", args.prompt]
+        eval_argv += ["--prompt", args.prompt]
     if args.prompts:
-        eval_cmd += ["--prompts", args.prompts]
+        eval_argv += ["--prompts", args.prompts]
     if args.model_small:
-        eval_cmd += ["--model-small", args.model_small]
+        eval_argv += ["--model-small", args.model_small]
     if args.model_large:
-        eval_cmd += ["--model-large", args.model_large]
+        eval_argv += ["--model-large", args.model_large]
     if args.no_fast:
-        eval_cmd.append("--no-fast")
+        eval_argv.append("--no-fast")
     if args.verbose:
-        eval_cmd.append("--verbose")
+        eval_argv.append("--verbose")
 
-    gate_cmd = [
-        py,
-        str(exp_dir / "neuroutine_gate.py"),
+    gate_argv = [
         "--steps",
         str(args.steps),
         "--ctx",
@@ -159,22 +166,29 @@ def main() -> int:
         str(args.metrics_timeout),
     ]
     if args.prompt:
-        gate_cmd += ["--prompt", args.prompt]
+        gate_argv += ["--prompt", args.prompt]
     if args.prompts:
-        gate_cmd += ["--prompts", args.prompts]
+        gate_argv += ["--prompts", args.prompts]
     if args.model_small:
-        gate_cmd += ["--model-small", args.model_small]
+        gate_argv += ["--model-small", args.model_small]
     if args.model_large:
-        gate_cmd += ["--model-large", args.model_large]
+        gate_argv += ["--model-large", args.model_large]
     if args.no_fast:
-        gate_cmd.append("--no-fast")
+        gate_argv.append("--no-fast")
     if args.verbose:
-        gate_cmd.append("--verbose")
-
-    run_step("collect", collect_cmd)
-    run_step("train", train_cmd)
-    run_step("eval", eval_cmd)
-    run_step("gate", gate_cmd)
+        gate_argv.append("--verbose")
+
+    # collect, eval and gate start runners with identical settings, so one small/large pair is
+    # started here and handed to each stage instead of reloading both models per stage.
+    collect_args = neuroutine_collect.parse_args(collect_argv)
+    runners = start_runners(collect_args)
+    try:
+        run_stage("collect", collect_argv, lambda: neuroutine_collect.run(collect_args, runners))
+        run_stage("train", train_argv, lambda: neuroutine_train.run(neuroutine_train.parse_args(train_argv)))
+        run_stage("eval", eval_argv, lambda: neuroutine_eval.run(neuroutine_eval.parse_args(eval_argv), runners))
+        run_stage("gate", gate_argv, lambda: neuroutine_gate.run(neuroutine_gate.parse_args(gate_argv), runners))
+    finally:
+        stop_runners(runners)
     if args.loop:
         loop_cmd = [
             py,
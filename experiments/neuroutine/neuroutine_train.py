@@ -3,32 +3,82 @@ import argparse
 import json
 from pathlib import Path
 
+import numpy as np
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    orjson = None  # type: ignore
+
 from neuroutine_controller import (
     compute_norm,
     evaluate_probs,
     features_from_row,
-    logreg_prob,
-    mlp_prob,
-    normalize,
+    logreg_probs,
+    mlp_probs,
     train_logreg,
     train_mlp,
 )
 
 
-def load_rows(path: Path) -> list[dict]:
-    rows: list[dict] = []
-    for line in path.read_text(encoding="utf-8").splitlines():
-        line = line.strip()
-        if not line:
+def load_dataset(path: Path) -> tuple[np.ndarray, np.ndarray]:
+    # Rows are reduced to (features, label) as they are parsed; no list of row dicts is kept.
+    loads = orjson.loads if orjson is not None else json.loads
+    features: list[list[float]] = []
+    labels: list[int] = []
+    for line in path.read_bytes().split(b"\n"):
+        if not line.strip():
             continue
-        rows.append(json.loads(line))
-    return rows
+        row = loads(line)
+        features.append(features_from_row(row))
+        labels.append(int(row.get("label", 0)))
+    return np.asarray(features, dtype=np.float32), np.asarray(labels, dtype=np.int8)
 
 
-def main() -> int:
+def dump_weights(out: dict, pretty: bool = False) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(out, option=orjson.OPT_INDENT_2 if pretty else None) + b"\n"
+    if pretty:
+        return (json.dumps(out, indent=2, ensure_ascii=False) + "\n").encode("utf-8")
+    return (json.dumps(out, separators=(",", ":"), ensure_ascii=False) + "\n").encode("utf-8")
+
+
+def save_weights(
+    out_path: Path,
+    out: dict,
+    arrays: dict[str, np.ndarray],
+    dtype: str,
+    pretty: bool,
+) -> None:
+    # Arrays go to a compressed .npz; the JSON keeps only scalars and the .npz file name.
+    # mean/std stay float32: they are one value per feature, so float16 would save nothing,
+    # and the loader folds them into the first layer (bias -= w / std * mean), where their
+    # rounding would shift every score. Weights are upcast again by load_weights_payload.
+    npz_path = out_path.with_suffix(".npz")
+    stored = {
+        key: value if key in ("mean", "std") else value.astype(dtype)
+        for key, value in arrays.items()
+    }
+    np.savez_compressed(npz_path, **stored)
+    out_path.write_bytes(dump_weights({**out, "arrays": npz_path.name, "dtype": dtype}, pretty))
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Train a tiny neuroutine controller (MLP or logistic regression).")
     parser.add_argument("--data", default="data/neuroutine_train.jsonl", help="JSONL training data")
-    parser.add_argument("--out", default="data/neuroutine_weights.json", help="Output weights JSON")
+    parser.add_argument(
+        "--out",
+        default="data/neuroutine_weights.json",
+        help="Output weights manifest (arrays are written next to it as .npz)",
+    )
+    parser.add_argument("--legacy-json", action="store_true", help="Write every weight into the JSON file instead")
+    parser.add_argument("--pretty", action="store_true", help="Indent the JSON output")
+    parser.add_argument(
+        "--weights-dtype",
+        choices=["float32", "float16"],
+        default="float32",
+        help="Storage dtype for the .npz weight matrices (float16 halves the file)",
+    )
     parser.add_argument(
         "--controller",
         choices=("mlp", "logreg"),
@@ -39,45 +89,50 @@ def main() -> int:
     parser.add_argument("--steps", type=int, default=400, help="Gradient steps")
     parser.add_argument("--lr", type=float, default=0.1, help="Learning rate")
     parser.add_argument("--l2", type=float, default=0.0, help="L2 regularization")
-    parser.add_argument("--seed", type=int, default=1, help="Seed for MLP init")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for MLP init and batch sampling")
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=256,
+        help="Mini-batch size; datasets no larger than this train full-batch (0 = always full-batch)",
+    )
     parser.add_argument("--no-normalize", action="store_true", help="Disable feature normalization")
-    args = parser.parse_args()
+    return parser.parse_args(argv)
+
 
+def run(args: argparse.Namespace) -> int:
     path = Path(args.data)
-    rows = load_rows(path)
-    if not rows:
+    X, y = load_dataset(path)
+    if not len(y):
         raise SystemExit("no training rows found")
 
-    X = [features_from_row(row) for row in rows]
-    y = [int(row.get("label", 0)) for row in rows]
-
-    pos = sum(y)
-    neg = len(y) - pos
+    counts = np.bincount(y, minlength=2)
+    neg, pos = int(counts[0]), int(counts[1])
     if pos == 0 or neg == 0:
         raise SystemExit(f"need pos+neg labels to train (pos={pos} neg={neg})")
 
-    mean = [0.0] * len(X[0])
-    std = [1.0] * len(X[0])
+    mean = np.zeros(X.shape[1], dtype=np.float32)
+    std = np.ones(X.shape[1], dtype=np.float32)
     if not args.no_normalize:
         mean, std = compute_norm(X)
-        X = normalize(X, mean, std)
+        np.subtract(X, mean, out=X)
+        np.divide(X, std, out=X)
 
+    arrays: dict[str, np.ndarray] = {"mean": mean, "std": std}
     out: dict = {
-        "mean": mean,
-        "std": std,
-        "samples": len(rows),
+        "samples": len(y),
         "pos": pos,
         "neg": neg,
     }
-    probs: list[float]
+    probs: np.ndarray
     if args.controller == "logreg":
-        w, b = train_logreg(X, y, args.steps, args.lr, args.l2)
-        probs = [logreg_prob(w, b, row) for row in X]
+        w, b = train_logreg(X, y, args.steps, args.lr, args.l2, batch_size=args.batch_size, seed=args.seed)
+        arrays["weights"] = np.asarray(w, dtype=np.float32)
+        probs = logreg_probs(X, arrays["weights"], b)
         acc, avg_prob = evaluate_probs(y, probs)
         out.update(
             {
                 "type": "logreg_v1",
-                "weights": w,
                 "bias": b,
                 "train_acc": acc,
                 "avg_prob": avg_prob,
@@ -92,30 +147,39 @@ def main() -> int:
             lr=args.lr,
             l2=args.l2,
             seed=args.seed,
+            batch_size=args.batch_size,
         )
-        probs = [mlp_prob(W1, b1, W2, b2, row) for row in X]
+        arrays["W1"] = np.asarray(W1, dtype=np.float32)
+        arrays["b1"] = np.asarray(b1, dtype=np.float32)
+        arrays["W2"] = np.asarray(W2, dtype=np.float32)
+        probs = mlp_probs(X, arrays["W1"], arrays["b1"], arrays["W2"], b2)
         acc, avg_prob = evaluate_probs(y, probs)
         out.update(
             {
                 "type": "mlp_v1",
                 "hidden": max(1, args.hidden),
-                "W1": W1,
-                "b1": b1,
-                "W2": W2,
                 "b2": b2,
                 "train_acc": acc,
                 "avg_prob": avg_prob,
             }
         )
 
-    Path(args.out).write_text(json.dumps(out, indent=2, ensure_ascii=True) + "\n", encoding="utf-8")
+    if args.legacy_json:
+        out.update({key: value.tolist() for key, value in arrays.items()})
+        Path(args.out).write_bytes(dump_weights(out, args.pretty))
+    else:
+        save_weights(Path(args.out), out, arrays, args.weights_dtype, args.pretty)
     print(f"Wrote {args.out}")
     print(
         f"type={out.get('type')} train_acc={out.get('train_acc'):.3f} "
-        f"avg_prob={out.get('avg_prob'):.3f} samples={len(rows)} pos={pos} neg={neg}"
+        f"avg_prob={out.get('avg_prob'):.3f} samples={len(y)} pos={pos} neg={neg}"
     )
     return 0
 
 
+def main() -> int:
+    return run(parse_args())
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -0,0 +1,26 @@
+import functools
+from pathlib import Path
+
+
+@functools.lru_cache(maxsize=1)
+def repo_root() -> Path:
+    here = Path(__file__).resolve()
+    for parent in here.parents:
+        if (parent / "pyproject.toml").exists() or (parent / ".git").exists():
+            return parent
+    return here.parents[2]
+
+
+@functools.lru_cache(maxsize=None)
+def resolve_runner(root: Path, override: str | None) -> str:
+    if override:
+        return override
+    candidates = [
+        root / "bin" / "noxlocal",
+        root / "noxpy" / "localrunner" / "noxlocal",
+        root.parent / "noxpy" / "localrunner" / "noxlocal",
+    ]
+    for candidate in candidates:
+        if candidate.exists():
+            return str(candidate)
+    return "noxlocal"
@@ -0,0 +1,170 @@
+import collections
+import os
+import selectors
+import subprocess
+import sys
+import threading
+import time
+
+
+RS = b"\x1e"
+READ_CHUNK = 65536
+STDERR_CHUNK = 65536
+STDERR_TAIL_LINES = 20
+
+# Bytes read past the last RS, kept per runner until the next read_frame call.
+_stdout_buffers: dict[subprocess.Popen, bytearray] = {}
+# Last stderr lines per runner; the final entry is the line still being written.
+_stderr_tails: dict[subprocess.Popen, collections.deque[bytes]] = {}
+_stderr_closed: dict[subprocess.Popen, threading.Event] = {}
+
+
+def drain_stderr(*procs: subprocess.Popen, verbose: bool = True) -> threading.Thread:
+    # One thread multiplexes every runner's stderr instead of one blocked reader per process.
+    # Only a bounded tail is kept (see last_stderr_line); verbose also echoes it all.
+    selector = selectors.DefaultSelector()
+    for proc in procs:
+        if proc.stderr is None:
+            continue
+        fd = proc.stderr.fileno()
+        os.set_blocking(fd, False)
+        _stderr_tails[proc] = collections.deque([b""], maxlen=STDERR_TAIL_LINES)
+        _stderr_closed[proc] = threading.Event()
+        selector.register(fd, selectors.EVENT_READ, proc)
+    thread = threading.Thread(target=_drain_loop, args=(selector, verbose), daemon=True)
+    thread.start()
+    return thread
+
+
+def _drain_loop(selector: selectors.BaseSelector, verbose: bool) -> None:
+    out = sys.stderr.buffer
+    while selector.get_map():
+        for key, _ in selector.select():
+            try:
+                chunk = os.read(key.fd, STDERR_CHUNK)
+            except BlockingIOError:
+                continue
+            if not chunk:
+                selector.unregister(key.fd)
+                _stderr_closed[key.data].set()
+                continue
+            tail = _stderr_tails[key.data]
+            lines = chunk.split(b"\n")
+            tail[-1] += lines[0]
+            tail.extend(lines[1:])
+            if verbose:
+                out.write(chunk)
+        if verbose:
+            out.flush()
+    selector.close()
+
+
+def last_stderr_line(proc: subprocess.Popen) -> str:
+    for line in reversed(tuple(_stderr_tails.get(proc, ()))):
+        if line.strip():
+            return line.decode("utf-8", errors="replace").strip()
+    return ""
+
+
+def _check_exit(proc: subprocess.Popen) -> None:
+    # EOF on stdout normally means the runner died; give it a moment to be reaped.
+    try:
+        rc = proc.wait(timeout=1.0)
+    except subprocess.TimeoutExpired:
+        return
+    if rc != 0:
+        closed = _stderr_closed.get(proc)
+        if closed is not None:
+            closed.wait(timeout=1.0)  # let the drain thread read the runner's last words
+        raise RuntimeError(f"runner failed ({rc}): {last_stderr_line(proc)}")
+
+
+def read_frame(proc: subprocess.Popen) -> bytes:
+    stream = proc.stdout
+    if stream is None:
+        return b""
+    fd = stream.fileno()
+    buf = _stdout_buffers.setdefault(proc, bytearray())
+    while True:
+        idx = buf.find(RS)
+        if idx >= 0:
+            out = bytes(buf[:idx])
+            del buf[: idx + 1]
+            return out
+        chunk = os.read(fd, READ_CHUNK)
+        if not chunk:
+            _check_exit(proc)
+            out = bytes(buf)
+            buf.clear()
+            return out
+        buf.extend(chunk)
+
+
+def read_until_rs(proc: subprocess.Popen) -> str:
+    return read_frame(proc).decode("utf-8", errors="replace")
+
+
+def start_runner(
+    runner: str,
+    model: str,
+    ctx: int,
+    batch: int,
+    max_tokens: int,
+    fast: bool,
+) -> subprocess.Popen:
+    cmd = [
+        runner,
+        "-serve",
+        "-serve-rs",
+        "-raw",
+        "-keep-cache",
+        "-max-tokens",
+        str(max_tokens),
+        "-ctx",
+        str(ctx),
+        "-batch",
+        str(batch),
+        "-model",
+        model,
+    ]
+    if fast:
+        cmd.append("-fast")
+    # stderr must be handed to drain_stderr() once all runners are started.
+    return subprocess.Popen(
+        cmd,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        bufsize=0,
+    )
+
+
+def send_prompt(proc: subprocess.Popen, prompt: str | bytes) -> str:
+    stdin = proc.stdin
+    if stdin is None:
+        raise RuntimeError("stdin unavailable")
+    # Callers sending a long prompt more than once pass it pre-encoded.
+    data = prompt.encode("utf-8") if isinstance(prompt, str) else prompt
+    # bufsize=0 makes stdin a raw FileIO: one write() is one write(2), nothing to flush.
+    try:
+        stdin.write(b"".join((data, RS)))
+    except BrokenPipeError:
+        pass  # the runner is gone; read_frame reports its exit code
+    return read_until_rs(proc)
+
+
+def timed_send(proc: subprocess.Popen, prompt: str | bytes) -> tuple[str, float]:
+    start = time.perf_counter()
+    out = send_prompt(proc, prompt)
+    return out, time.perf_counter() - start
+
+
+def stop_runners(*procs: subprocess.Popen) -> None:
+    for proc in procs:
+        try:
+            if proc.stdin:
+                proc.stdin.write(b"exit" + RS)
+                proc.stdin.flush()
+        except Exception:
+            pass
+        proc.terminate()
@@ -1,69 +1,9 @@
 #!/usr/bin/env python3
 import argparse
-import subprocess
 import time
-from pathlib import Path
 
-
-def repo_root() -> Path:
-    here = Path(__file__).resolve()
-    for parent in (here.parent, *here.parents):
-        if (parent / "pyproject.toml").exists() or (parent / ".git").exists():
-            return parent
-    return here.parents[2]
-
-
-def resolve_runner(root: Path, override: str | None) -> str:
-    if override:
-        return override
-    candidates = [
-        root / "bin" / "noxlocal",
-        root / "noxpy" / "localrunner" / "noxlocal",
-        root.parent / "noxpy" / "localrunner" / "noxlocal",
-    ]
-    for candidate in candidates:
-        if candidate.exists():
-            return str(candidate)
-    return "noxlocal"
-
-
-def run_model(
-    runner: str,
-    model: str,
-    prompt: str,
-    max_tokens: int,
-    ctx: int,
-    batch: int,
-    fast: bool,
-) -> tuple[str, float, str]:
-    cmd = [
-        runner,
-        "-model",
-        model,
-        "-raw",
-        "-ctx",
-        str(ctx),
-        "-batch",
-        str(batch),
-        "-max-tokens",
-        str(max_tokens),
-    ]
-    if fast:
-        cmd.append("-fast")
-    start = time.perf_counter()
-    proc = subprocess.run(
-        cmd,
-        input=prompt,
-        text=True,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-    )
-    elapsed = time.perf_counter() - start
-    out = proc.stdout
-    err = proc.stderr.strip()
-    if proc.returncode != 0:
-        raise RuntimeError(f"runner failed ({proc.returncode}): {err}")
-    return out, elapsed, err
+from _paths import repo_root, resolve_runner
+from _runner import drain_stderr, last_stderr_line, send_prompt, start_runner, stop_runners
 
 
 def build_prompt(repeats: int) -> tuple[str, str]:
@@ -77,10 +17,9 @@ def build_prompt(repeats: int) -> tuple[str, str]:
             "Ignore filler. Do not answer until the final task block.",
         ]
     )
-    big_block = "\n".join([filler] * max(1, repeats))
+    big_block = (filler + "\n") * max(1, repeats)
     prompt = f"""
 {big_block}
-
 TASK (FALSIFIABLE):
 Return exactly this string and nothing else:
 {expected}
@@ -120,6 +59,7 @@ def main() -> int:
         default=None,
         help="Expected substring for pass/fail check",
     )
+    parser.add_argument("--verbose", action="store_true", help="Stream runner stderr")
     args = parser.parse_args()
 
     root = repo_root()
@@ -137,39 +77,39 @@ def main() -> int:
     if expected:
         print("Expected:", expected)
 
-    print("\n[1/2] small model...")
-    small_out, small_time, small_err = run_model(
-        runner,
-        model_small,
-        prompt,
-        max_tokens=args.max_tokens,
-        ctx=args.ctx,
-        batch=args.batch,
-        fast=not args.no_fast,
-    )
-    ok = expected in small_out if expected else False
-    print(f"small output: {small_out!r} ({small_time:.2f}s)")
-    if small_err:
-        print("small stderr (last line):", small_err.splitlines()[-1])
-    print("small pass:", ok)
-
-    if ok:
-        print("\nEarly-exit: small model accepted.")
-        return 0
-
-    print("\n[2/2] large model fallback...")
-    large_out, large_time, large_err = run_model(
-        runner,
-        model_large,
-        prompt,
-        max_tokens=args.max_tokens,
-        ctx=args.ctx,
-        batch=args.batch,
-        fast=not args.no_fast,
-    )
-    print(f"large output: {large_out!r} ({large_time:.2f}s)")
-    if large_err:
-        print("large stderr (last line):", large_err.splitlines()[-1])
+    # The 7B runner is only started on fallback: early exit is the common case.
+    fast = not args.no_fast
+    small_proc = start_runner(runner, model_small, args.ctx, args.batch, args.max_tokens, fast)
+    drain_stderr(small_proc, verbose=args.verbose)
+    procs = [small_proc]
+    prompt_bytes = prompt.encode("utf-8")
+    try:
+        print("\n[1/2] small model...")
+        start = time.perf_counter()
+        small_out = send_prompt(small_proc, prompt_bytes)
+        small_time = time.perf_counter() - start
+        ok = expected in small_out if expected else False
+        print(f"small output: {small_out!r} ({small_time:.2f}s)")
+        if not args.verbose and last_stderr_line(small_proc):
+            print("small stderr (last line):", last_stderr_line(small_proc))
+        print("small pass:", ok)
+
+        if ok:
+            print("\nEarly-exit: small model accepted.")
+            return 0
+
+        print("\n[2/2] large model fallback...")
+        start = time.perf_counter()
+        large_proc = start_runner(runner, model_large, args.ctx, args.batch, args.max_tokens, fast)
+        procs.append(large_proc)
+        drain_stderr(large_proc, verbose=args.verbose)
+        large_out = send_prompt(large_proc, prompt_bytes)
+        large_time = time.perf_counter() - start
+        print(f"large output: {large_out!r} ({large_time:.2f}s)")
+        if not args.verbose and last_stderr_line(large_proc):
+            print("large stderr (last line):", last_stderr_line(large_proc))
+    finally:
+        stop_runners(*procs)
     return 0
 
 
@@ -1,101 +1,9 @@
 #!/usr/bin/env python3
 import argparse
-import subprocess
-import sys
-import threading
-import time
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
-
-RS = b"\x1e"
-
-
-def repo_root() -> Path:
-    here = Path(__file__).resolve()
-    for parent in (here.parent, *here.parents):
-        if (parent / "pyproject.toml").exists() or (parent / ".git").exists():
-            return parent
-    return here.parents[2]
-
-
-def resolve_runner(root: Path, override: str | None) -> str:
-    if override:
-        return override
-    candidates = [
-        root / "bin" / "noxlocal",
-        root / "noxpy" / "localrunner" / "noxlocal",
-        root.parent / "noxpy" / "localrunner" / "noxlocal",
-    ]
-    for candidate in candidates:
-        if candidate.exists():
-            return str(candidate)
-    return "noxlocal"
-
-
-def drain_stderr(proc: subprocess.Popen) -> None:
-    stream = proc.stderr
-    if stream is None:
-        return
-    for chunk in iter(lambda: stream.read(4096), b""):
-        sys.stderr.buffer.write(chunk)
-        sys.stderr.buffer.flush()
-
-
-def read_until_rs(proc: subprocess.Popen) -> str:
-    out = bytearray()
-    stream = proc.stdout
-    if stream is None:
-        return ""
-    while True:
-        ch = stream.read(1)
-        if ch == b"" or ch == RS:
-            break
-        out.extend(ch)
-    return out.decode("utf-8", errors="replace")
-
-
-def start_runner(
-    runner: str,
-    model: str,
-    ctx: int,
-    batch: int,
-    fast: bool,
-) -> subprocess.Popen:
-    cmd = [
-        runner,
-        "-serve",
-        "-serve-rs",
-        "-raw",
-        "-keep-cache",
-        "-max-tokens",
-        "1",
-        "-ctx",
-        str(ctx),
-        "-batch",
-        str(batch),
-        "-model",
-        model,
-    ]
-    if fast:
-        cmd.append("-fast")
-    proc = subprocess.Popen(
-        cmd,
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        bufsize=0,
-    )
-    threading.Thread(target=drain_stderr, args=(proc,), daemon=True).start()
-    return proc
-
-
-def send_prompt(proc: subprocess.Popen, prompt: str) -> str:
-    stdin = proc.stdin
-    if stdin is None:
-        raise RuntimeError("stdin unavailable")
-    stdin.write(prompt.encode("utf-8") + RS)
-    stdin.flush()
-    return read_until_rs(proc)
+from _paths import repo_root, resolve_runner
+from _runner import drain_stderr, start_runner, stop_runners, timed_send
 
 
 def main() -> int:
@@ -128,8 +36,9 @@ def main() -> int:
     model_large = args.model_large or str(root / "assets" / "models" / "mistral-7b-q4.gguf")
 
     fast = not args.no_fast
-    small_proc = start_runner(runner, model_small, args.ctx, args.batch, fast)
-    large_proc = start_runner(runner, model_large, args.ctx, args.batch, fast)
+    small_proc = start_runner(runner, model_small, args.ctx, args.batch, 1, fast)
+    large_proc = start_runner(runner, model_large, args.ctx, args.batch, 1, fast)
+    drain_stderr(small_proc, large_proc)
 
     prompt = args.prompt
     print("Prompt:", prompt)
@@ -137,36 +46,31 @@ def main() -> int:
 
     total_small = 0.0
     total_large = 0.0
-    for step in range(1, args.steps + 1):
-        start = time.perf_counter()
-        tok_small = send_prompt(small_proc, prompt)
-        total_small += time.perf_counter() - start
-
-        start = time.perf_counter()
-        tok_large = send_prompt(large_proc, prompt)
-        total_large += time.perf_counter() - start
-
-        if tok_small == tok_large:
-            chosen = tok_small
-            decision = "agree"
-        else:
-            chosen = tok_large if args.choose == "large" else tok_small
-            decision = f"disagree->use-{args.choose}"
-
-        print(f"{step:02d} small={tok_small!r} large={tok_large!r} => {decision}")
-        prompt += chosen
+    # The runners are separate processes, so both answer at once: each step costs
+    # max(small, large) instead of small + large.
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        for step in range(1, args.steps + 1):
+            small_future = pool.submit(timed_send, small_proc, prompt)
+            large_future = pool.submit(timed_send, large_proc, prompt)
+            tok_small, small_dt = small_future.result()
+            tok_large, large_dt = large_future.result()
+            total_small += small_dt
+            total_large += large_dt
+
+            if tok_small == tok_large:
+                chosen = tok_small
+                decision = "agree"
+            else:
+                chosen = tok_large if args.choose == "large" else tok_small
+                decision = f"disagree->use-{args.choose}"
+
+            print(f"{step:02d} small={tok_small!r} large={tok_large!r} => {decision}")
+            prompt += chosen
 
     print(f"\nfinal prompt tail: {prompt[-80:]!r}")
     print(f"time small={total_small:.2f}s large={total_large:.2f}s")
 
-    for proc in (small_proc, large_proc):
-        try:
-            if proc.stdin:
-                proc.stdin.write(b"exit" + RS)
-                proc.stdin.flush()
-        except Exception:
-            pass
-        proc.terminate()
+    stop_runners(small_proc, large_proc)
     return 0
 
 
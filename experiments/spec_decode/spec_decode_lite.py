@@ -1,102 +1,9 @@
 #!/usr/bin/env python3
 import argparse
-import subprocess
-import sys
-import threading
-import time
-from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
-
-RS = b"\x1e"
-
-
-def repo_root() -> Path:
-    here = Path(__file__).resolve()
-    for parent in (here.parent, *here.parents):
-        if (parent / "pyproject.toml").exists() or (parent / ".git").exists():
-            return parent
-    return here.parents[2]
-
-
-def resolve_runner(root: Path, override: str | None) -> str:
-    if override:
-        return override
-    candidates = [
-        root / "bin" / "noxlocal",
-        root / "noxpy" / "localrunner" / "noxlocal",
-        root.parent / "noxpy" / "localrunner" / "noxlocal",
-    ]
-    for candidate in candidates:
-        if candidate.exists():
-            return str(candidate)
-    return "noxlocal"
-
-
-def drain_stderr(proc: subprocess.Popen) -> None:
-    stream = proc.stderr
-    if stream is None:
-        return
-    for chunk in iter(lambda: stream.read(4096), b""):
-        sys.stderr.buffer.write(chunk)
-        sys.stderr.buffer.flush()
-
-
-def read_until_rs(proc: subprocess.Popen) -> str:
-    out = bytearray()
-    stream = proc.stdout
-    if stream is None:
-        return ""
-    while True:
-        ch = stream.read(1)
-        if ch == b"" or ch == RS:
-            break
-        out.extend(ch)
-    return out.decode("utf-8", errors="replace")
-
-
-def start_runner(
-    runner: str,
-    model: str,
-    ctx: int,
-    batch: int,
-    max_tokens: int,
-    fast: bool,
-) -> subprocess.Popen:
-    cmd = [
-        runner,
-        "-serve",
-        "-serve-rs",
-        "-raw",
-        "-keep-cache",
-        "-max-tokens",
-        str(max_tokens),
-        "-ctx",
-        str(ctx),
-        "-batch",
-        str(batch),
-        "-model",
-        model,
-    ]
-    if fast:
-        cmd.append("-fast")
-    proc = subprocess.Popen(
-        cmd,
-        stdin=subprocess.PIPE,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-        bufsize=0,
-    )
-    threading.Thread(target=drain_stderr, args=(proc,), daemon=True).start()
-    return proc
-
-
-def send_prompt(proc: subprocess.Popen, prompt: str) -> str:
-    stdin = proc.stdin
-    if stdin is None:
-        raise RuntimeError("stdin unavailable")
-    stdin.write(prompt.encode("utf-8") + RS)
-    stdin.flush()
-    return read_until_rs(proc)
+from _paths import repo_root, resolve_runner
+from _runner import drain_stderr, start_runner, stop_runners, timed_send
 
 
 def main() -> int:
@@ -135,6 +42,7 @@ def main() -> int:
     fast = not args.no_fast
     small_proc = start_runner(runner, model_small, args.ctx, args.batch, args.draft, fast)
     large_proc = start_runner(runner, model_large, args.ctx, args.batch, args.draft, fast)
+    drain_stderr(small_proc, large_proc)
 
     prompt = args.prompt
     print("Prompt:", prompt)
@@ -142,47 +50,53 @@ def main() -> int:
     print("Verify every:", args.verify_every)
 
     agree_count = 0
-    for step in range(1, args.steps + 1):
-        start = time.perf_counter()
-        draft = send_prompt(small_proc, prompt)
-        small_time = time.perf_counter() - start
-
-        verify = ""
-        large_time = 0.0
-        verified = (step % args.verify_every) == 0
-        if verified:
-            start = time.perf_counter()
-            verify = send_prompt(large_proc, prompt)
-            large_time = time.perf_counter() - start
-
-        if not verified:
-            chosen = draft
-            decision = "skip-verify"
-        elif draft == verify:
-            chosen = draft
-            decision = "agree"
-            agree_count += 1
-        else:
-            chosen = verify
-            decision = "disagree->large"
-
-        print(
-            f"{step:02d} draft={draft!r} verify={verify!r} => {decision} "
-            f"(small={small_time:.2f}s large={large_time:.2f}s)"
-        )
-        prompt += chosen
-
-    print(f"\nagreements: {agree_count}/{args.steps}")
+    rollbacks = 0
+    # One worker per runner keeps each stdin/stdout strictly request/response ordered.
+    # The large runner verifies step k while the small one already drafts step k+1 on the
+    # assumption that draft k is kept; a disagreement throws that draft away and redrafts.
+    with (
+        ThreadPoolExecutor(max_workers=1) as small_pool,
+        ThreadPoolExecutor(max_workers=1) as large_pool,
+    ):
+        draft_future = small_pool.submit(timed_send, small_proc, prompt)
+        for step in range(1, args.steps + 1):
+            verified = (step % args.verify_every) == 0
+            verify_future = large_pool.submit(timed_send, large_proc, prompt) if verified else None
+            draft, small_time = draft_future.result()
+            next_draft = None
+            if step < args.steps:
+                next_draft = small_pool.submit(timed_send, small_proc, prompt + draft)
+
+            verify = ""
+            large_time = 0.0
+            if verify_future is not None:
+                verify, large_time = verify_future.result()
+
+            if not verified:
+                chosen = draft
+                decision = "skip-verify"
+            elif draft == verify:
+                chosen = draft
+                decision = "agree"
+                agree_count += 1
+            else:
+                chosen = verify
+                decision = "disagree->large"
+                if next_draft is not None:
+                    next_draft = small_pool.submit(timed_send, small_proc, prompt + chosen)
+                    rollbacks += 1
+
+            print(
+                f"{step:02d} draft={draft!r} verify={verify!r} => {decision} "
+                f"(small={small_time:.2f}s large={large_time:.2f}s)"
+            )
+            prompt += chosen
+            draft_future = next_draft
+
+    print(f"\nagreements: {agree_count}/{args.steps} draft rollbacks: {rollbacks}")
     print(f"final prompt tail: {prompt[-80:]!r}")
 
-    for proc in (small_proc, large_proc):
-        try:
-            if proc.stdin:
-                proc.stdin.write(b"exit" + RS)
-                proc.stdin.flush()
-        except Exception:
-            pass
-        proc.terminate()
+    stop_runners(small_proc, large_proc)
     return 0
 
 
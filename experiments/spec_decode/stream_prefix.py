@@ -6,16 +6,8 @@ import threading
 import time
 from pathlib import Path
 
-
-RS = b"\x1e"
-
-
-def repo_root() -> Path:
-    here = Path(__file__).resolve()
-    for parent in (here.parent, *here.parents):
-        if (parent / "pyproject.toml").exists() or (parent / ".git").exists():
-            return parent
-    return here.parents[2]
+from _paths import repo_root
+from _runner import RS, read_frame
 
 
 def resolve_path(path: str | None, fallback: Path) -> str:
@@ -37,21 +29,6 @@ def drain_stderr(proc: subprocess.Popen, verbose: bool) -> None:
         sys.stderr.buffer.flush()
 
 
-def read_until_rs(proc: subprocess.Popen) -> bytes:
-    out = bytearray()
-    stream = proc.stdout
-    if stream is None:
-        return bytes(out)
-    while True:
-        ch = stream.read(1)
-        if ch == b"":
-            break
-        if ch == RS:
-            break
-        out.extend(ch)
-    return bytes(out)
-
-
 def main() -> int:
     parser = argparse.ArgumentParser(description="Stream prefix prompts to noxlocal.")
     parser.add_argument(
@@ -71,9 +48,20 @@ def main() -> int:
     parser.add_argument("--delay-ms", type=int, default=50, help="Delay between prefixes")
     parser.add_argument("--append", action="store_true", help="Append prompts (no reset)")
     parser.add_argument("--no-keep-cache", action="store_true", help="Disable keep-cache")
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Send only the newly added text each step (implies --append; needs keep-cache)",
+    )
     parser.add_argument("--verbose", action="store_true", help="Stream stderr")
 
     args = parser.parse_args()
+    # The runner only extends its cached context with each suffix when it both appends
+    # prompts and keeps its KV cache; otherwise it would see bare one-character prompts.
+    if args.incremental:
+        if args.no_keep_cache:
+            parser.error("--incremental cannot be combined with --no-keep-cache")
+        args.append = True
 
     root = repo_root()
     runner = resolve_path(args.runner, root / "bin" / "noxlocal")
@@ -125,11 +113,16 @@ def main() -> int:
 
     text = args.text
     delay = max(0, args.delay_ms) / 1000.0
+    last = 0
     for i in range(1, len(text) + 1):
-        prefix = text[:i].encode("utf-8")
+        if args.incremental:
+            prefix = text[last:i].encode("utf-8")
+            last = i
+        else:
+            prefix = text[:i].encode("utf-8")
         stdin.write(prefix + RS)
         stdin.flush()
-        out = read_until_rs(proc).decode("utf-8", errors="replace")
+        out = read_frame(proc).decode("utf-8", errors="replace")
         print(f"{i:02d} {text[:i]!r} => {out!r}")
         if delay:
             time.sleep(delay)
@@ -1,71 +1,9 @@
 #!/usr/bin/env python3
 import argparse
-import subprocess
-import sys
 import time
-from pathlib import Path
 
-
-def repo_root() -> Path:
-    here = Path(__file__).resolve()
-    for parent in (here.parent, *here.parents):
-        if (parent / "pyproject.toml").exists() or (parent / ".git").exists():
-            return parent
-    return here.parents[2]
-
-
-def resolve_runner(root: Path, override: str | None) -> str:
-    if override:
-        return override
-    candidates = [
-        root / "bin" / "noxlocal",
-        root / "noxpy" / "localrunner" / "noxlocal",
-        root.parent / "noxpy" / "localrunner" / "noxlocal",
-    ]
-    for candidate in candidates:
-        if candidate.exists():
-            return str(candidate)
-    return "noxlocal"
-
-
-def run_model(
-    runner: str,
-    model: str,
-    prompt: str,
-    max_tokens: int,
-    ctx: int,
-    batch: int,
-    fast: bool,
-) -> tuple[str, float, str]:
-    cmd = [
-        runner,
-        "-model",
-        model,
-        "-raw",
-        "-ctx",
-        str(ctx),
-        "-batch",
-        str(batch),
-        "-max-tokens",
-        str(max_tokens),
-    ]
-    if fast:
-        cmd.append("-fast")
-
-    start = time.perf_counter()
-    proc = subprocess.run(
-        cmd,
-        input=prompt,
-        text=True,
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE,
-    )
-    elapsed = time.perf_counter() - start
-    out = proc.stdout
-    err = proc.stderr.strip()
-    if proc.returncode != 0:
-        raise RuntimeError(f"runner failed ({proc.returncode}): {err}")
-    return out, elapsed, err
+from _paths import repo_root, resolve_runner
+from _runner import drain_stderr, last_stderr_line, send_prompt, start_runner, stop_runners
 
 
 def build_prompt(repeats: int) -> tuple[str, str]:
@@ -81,10 +19,9 @@ def build_prompt(repeats: int) -> tuple[str, str]:
             "This is a controlled experiment. Read carefully.",
         ]
     )
-    big_block = "\n".join([filler] * max(1, repeats))
+    big_block = (filler + "\n") * max(1, repeats)
     prompt = f"""
 {big_block}
-
 TASK (FALSIFIABLE):
 Return exactly this string and nothing else:
 {expected}
@@ -114,6 +51,7 @@ def main() -> int:
         default=12,
         help="Repeat count for filler block (controls prompt size)",
     )
+    parser.add_argument("--verbose", action="store_true", help="Stream runner stderr")
     args = parser.parse_args()
 
     root = repo_root()
@@ -125,35 +63,31 @@ def main() -> int:
     print("Prompt length:", len(prompt))
     print("Expected:", expected)
 
-    print("\n[1/2] 7B: waiting for first token...")
-    first_out, first_time, first_err = run_model(
-        runner,
-        model_7b,
-        prompt,
-        max_tokens=1,
-        ctx=args.ctx,
-        batch=args.batch,
-        fast=not args.no_fast,
-    )
-    first_token = first_out
-    print(f"7B first token: {first_token!r} ({first_time:.2f}s)")
-    if first_err:
-        print("7B stderr (last line):", first_err.splitlines()[-1])
-
-    chained_prompt = prompt + first_token
-    print("\n[2/2] 0.5B: continuing from prompt+first_token...")
-    cont_out, cont_time, cont_err = run_model(
-        runner,
-        model_small,
-        chained_prompt,
-        max_tokens=args.max_tokens,
-        ctx=args.ctx,
-        batch=args.batch,
-        fast=not args.no_fast,
-    )
-    print(f"0.5B output: {cont_out!r} ({cont_time:.2f}s)")
-    if cont_err:
-        print("0.5B stderr (last line):", cont_err.splitlines()[-1])
+    # Both models load at once, so the 0.5B cold start overlaps the 7B load and prefill.
+    fast = not args.no_fast
+    large_proc = start_runner(runner, model_7b, args.ctx, args.batch, 1, fast)
+    small_proc = start_runner(runner, model_small, args.ctx, args.batch, args.max_tokens, fast)
+    drain_stderr(large_proc, small_proc, verbose=args.verbose)
+    try:
+        print("\n[1/2] 7B: waiting for first token...")
+        start = time.perf_counter()
+        prompt_bytes = prompt.encode("utf-8")
+        first_token = send_prompt(large_proc, prompt_bytes)
+        first_time = time.perf_counter() - start
+        print(f"7B first token: {first_token!r} ({first_time:.2f}s)")
+        if not args.verbose and last_stderr_line(large_proc):
+            print("7B stderr (last line):", last_stderr_line(large_proc))
+
+        chained_prompt = prompt_bytes + first_token.encode("utf-8")
+        print("\n[2/2] 0.5B: continuing from prompt+first_token...")
+        start = time.perf_counter()
+        cont_out = send_prompt(small_proc, chained_prompt)
+        cont_time = time.perf_counter() - start
+        print(f"0.5B output: {cont_out!r} ({cont_time:.2f}s)")
+        if not args.verbose and last_stderr_line(small_proc):
+            print("0.5B stderr (last line):", last_stderr_line(small_proc))
+    finally:
+        stop_runners(large_proc, small_proc)
 
     return 0
 
@@ -4,20 +4,41 @@
 from __future__ import annotations
 
 import argparse
+import array
 import curses
+import functools
 import os
+import select
+import sys
 import time
 from pathlib import Path
-from typing import List, Optional, Sequence, Tuple
+from typing import List, Optional, Sequence, Tuple, Union
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    np = None  # type: ignore
+
+try:
+    from numba import njit, prange  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    njit = None  # type: ignore
+    prange = range
 
 try:
     from PIL import Image  # type: ignore
 except Exception:  # pragma: no cover - optional dependency
     Image = None  # type: ignore
 
-RESET = "\033[0m"
-UPPER_HALF = "▀"
-FULL_BLOCK = "█"
+# Without NumPy, rows are flat RGB byte arrays (3 bytes a pixel); tuple rows are also accepted.
+Pixels = Union["np.ndarray", Sequence["array.array[int]"], Sequence[Sequence[Tuple[int, int, int]]]]
+
+RESET = b"\033[0m"
+UPPER_HALF = "▀".encode("utf-8")
+FULL_BLOCK = "█".encode("utf-8")
+
+# Decimal spellings of every channel value, so SGR sequences are joined instead of formatted.
+DEC = [str(i).encode("ascii") for i in range(256)]
 
 
 # --------- color utilities --------------------------------------------------
@@ -27,168 +48,411 @@ def supports_truecolor() -> bool:
     return "truecolor" in colorterm or "24bit" in colorterm
 
 
-def rgb_to_fg(r: int, g: int, b: int) -> str:
-    return f"\033[38;2;{r};{g};{b}m"
+# Frames are encoded from one int key per pixel: r | g << 8 | b << 16 in truecolor, or an
+# xterm-256 index. Gradients and resized images reuse a small set of colours, so the
+# truecolor SGR strings are cached.
+@functools.lru_cache(maxsize=8192)
+def packed_fg(key: int) -> bytes:
+    return b"".join((b"\033[38;2;", DEC[key & 0xFF], b";", DEC[(key >> 8) & 0xFF], b";", DEC[key >> 16], b"m"))
+
+
+@functools.lru_cache(maxsize=8192)
+def packed_bg(key: int) -> bytes:
+    return b"".join((b"\033[48;2;", DEC[key & 0xFF], b";", DEC[(key >> 8) & 0xFF], b";", DEC[key >> 16], b"m"))
+
+
+# 256-colour SGR is about a third of the bytes of truecolor; every code is precomputed.
+PALETTE_FG = [b"\033[38;5;" + DEC[i] + b"m" for i in range(256)]
+PALETTE_BG = [b"\033[48;5;" + DEC[i] + b"m" for i in range(256)]
 
+# Nearest level of xterm's 6x6x6 colour cube (0, 95, 135, 175, 215, 255) per channel value.
+CUBE_LEVEL = bytes(0 if v < 48 else 1 if v < 115 else (v - 35) // 40 for v in range(256))
 
-def rgb_to_bg(r: int, g: int, b: int) -> str:
-    return f"\033[48;2;{r};{g};{b}m"
+
+def pack_rgb(pixels: "np.ndarray") -> "np.ndarray":
+    """Fold an (H, W, 3) uint8 array into (H, W) uint32 colour keys."""
+
+    rgb = pixels.astype(np.uint32)
+    packed = rgb[..., 2] << 16
+    packed |= rgb[..., 1] << 8
+    packed |= rgb[..., 0]
+    return packed
+
+
+def color_keys(pixels: Pixels, palette: bool) -> Pixels:
+    """Per-pixel colour keys: packed RGB, or colour-cube indices (16 + 36r + 6g + b)."""
+
+    if np is not None and isinstance(pixels, np.ndarray):
+        if not palette:
+            return pack_rgb(pixels)
+        level = np.frombuffer(CUBE_LEVEL, dtype=np.uint8)[pixels]
+        idx = level[..., 0] * 36
+        idx += level[..., 1] * 6
+        idx += level[..., 2]
+        idx += 16
+        return idx
+    rows = [zip(row[0::3], row[1::3], row[2::3]) if isinstance(row, array.array) else row for row in pixels]
+    if not palette:
+        return [[r | g << 8 | b << 16 for r, g, b in row] for row in rows]
+    lv = CUBE_LEVEL
+    return [[16 + 36 * lv[r] + 6 * lv[g] + lv[b] for r, g, b in row] for row in rows]
 
 
 # --------- frame packing ----------------------------------------------------
 
-def to_terminal_frame(pixels: Sequence[Sequence[Tuple[int, int, int]]]) -> List[str]:
-    """Pack two raster rows into one terminal line using half-block glyphs."""
+def to_terminal_frame(pixels: Pixels, palette: bool = False) -> List[bytes]:
+    """Pack two raster rows into one terminal line using half-block glyphs.
+
+    ``palette`` quantizes to the xterm 256-colour cube for terminals without truecolor.
+    """
 
-    lines: List[str] = []
-    row_iter = iter(pixels)
+    keys = color_keys(pixels, palette)
+    if np is not None and isinstance(keys, np.ndarray):
+        # Plain ints compare and index faster than NumPy scalars.
+        keys = keys.tolist()
+    fg_code, bg_code = (PALETTE_FG.__getitem__, PALETTE_BG.__getitem__) if palette else (packed_fg, packed_bg)
+    lines: List[bytes] = []
+    row_iter = iter(keys)
 
     for upper in row_iter:
         lower = next(row_iter, None)
-        parts: List[str] = []
-        for idx, (ru, gu, bu) in enumerate(upper):
-            top = rgb_to_fg(ru, gu, bu)
-            if lower is None or idx >= len(lower):
-                parts.append(top + FULL_BLOCK)
-                continue
-            rl, gl, bl = lower[idx]
-            bottom = rgb_to_bg(rl, gl, bl)
-            parts.append(top + bottom + UPPER_HALF)
-        lines.append("".join(parts) + RESET)
+        parts: List[bytes] = []
+        # SGR state persists across cells, so only colour changes are emitted; a run of
+        # identical cells costs one glyph each.
+        fg = bg = None
+        paired = 0
+        if lower is not None:
+            paired = min(len(upper), len(lower))
+            for top, bottom in zip(upper[:paired], lower[:paired]):
+                if top != fg:
+                    fg = top
+                    parts.append(fg_code(top))
+                if bottom != bg:
+                    bg = bottom
+                    parts.append(bg_code(bottom))
+                parts.append(UPPER_HALF)
+        for top in upper[paired:]:
+            if top != fg:
+                fg = top
+                parts.append(fg_code(top))
+            parts.append(FULL_BLOCK)
+        parts.append(RESET)
+        lines.append(b"".join(parts))
         if lower is None:
             break
     return lines
 
 
-def gradient_pixels(width: int, height_px: int, phase: float) -> List[List[Tuple[int, int, int]]]:
-    rows: List[List[Tuple[int, int, int]]] = []
-    for y in range(height_px):
-        row: List[Tuple[int, int, int]] = []
+def _gradient_loop(out, phase):  # pragma: no cover - compiled by numba
+    height_px, width = out.shape[0], out.shape[1]
+    for y in prange(height_px):
+        fy = y / max(height_px - 1, 1)
         for x in range(width):
             fx = x / max(width - 1, 1)
-            fy = y / max(height_px - 1, 1)
-            r = int(255 * abs((fx + phase) % 1.0))
-            g = int(255 * abs((fy + phase * 0.5) % 1.0))
-            b = int(255 * abs(((fx + fy) * 0.5 + phase * 0.25) % 1.0))
-            row.append((r, g, b))
+            out[y, x, 0] = int(255 * abs((fx + phase) % 1.0))
+            out[y, x, 1] = int(255 * abs((fy + phase * 0.5) % 1.0))
+            out[y, x, 2] = int(255 * abs(((fx + fy) * 0.5 + phase * 0.25) % 1.0))
+
+
+# One pass per pixel with no temporaries, rows split across cores.
+gradient_kernel = njit(parallel=True, cache=True, fastmath=True)(_gradient_loop) if njit is not None else None
+
+
+def gradient_pixels(
+    width: int,
+    height_px: int,
+    phase: float,
+    out: Optional["np.ndarray"] = None,
+) -> Pixels:
+    """Return a (height_px, width, 3) uint8 array, or flat RGB rows without NumPy.
+
+    ``out`` may be a preallocated array of that shape to fill instead of a new one.
+    """
+
+    if np is None:
+        return _gradient_pixels_py(width, height_px, phase)
+    if out is None:
+        out = np.empty((height_px, width, 3), dtype=np.uint8)
+    if gradient_kernel is not None:
+        gradient_kernel(out, phase)
+        return out
+    fx = (np.arange(width, dtype=np.float64) / max(width - 1, 1))[None, :]
+    fy = (np.arange(height_px, dtype=np.float64) / max(height_px - 1, 1))[:, None]
+    # Broadcasting fills whole planes; the uint8 store truncates like int().
+    out[..., 0] = 255 * np.abs(np.mod(fx + phase, 1.0))
+    out[..., 1] = 255 * np.abs(np.mod(fy + phase * 0.5, 1.0))
+    out[..., 2] = 255 * np.abs(np.mod((fx + fy) * 0.5 + phase * 0.25, 1.0))
+    return out
+
+
+def _gradient_pixels_py(width: int, height_px: int, phase: float) -> List["array.array[int]"]:
+    # Red depends only on x and green only on y, so only blue is computed per pixel; each
+    # channel is stored into the row with one strided slice assignment.
+    fxs = [x / max(width - 1, 1) for x in range(width)]
+    reds = array.array("B", [int(255 * abs((fx + phase) % 1.0)) for fx in fxs])
+    rows: List["array.array[int]"] = []
+    for y in range(height_px):
+        fy = y / max(height_px - 1, 1)
+        row = array.array("B", bytes(3 * width))
+        row[0::3] = reds
+        row[1::3] = array.array("B", [int(255 * abs((fy + phase * 0.5) % 1.0))]) * width
+        row[2::3] = array.array("B", [int(255 * abs(((fx + fy) * 0.5 + phase * 0.25) % 1.0)) for fx in fxs])
         rows.append(row)
     return rows
 
 
-def gradient_frame(width: int, height: int, phase: float) -> List[str]:
+def gradient_frame(width: int, height: int, phase: float) -> List[bytes]:
     return to_terminal_frame(gradient_pixels(width, height * 2, phase))
 
 
-def load_image_frame(path: Path, width: int, height: int) -> List[str]:
+RESAMPLE = ("lanczos", "bilinear")
+
+
+def load_image_pixels(path: Path, width: int, height: int, resample: str = "lanczos") -> Pixels:
     if Image is None:
         raise RuntimeError("Install Pillow (`pip install pillow`) for image rendering.")
     image = Image.open(path).convert("RGB")
-    image = image.resize((width, height * 2), Image.LANCZOS)
-    pixels = list(image.getdata())
-    rows: List[List[Tuple[int, int, int]]] = []
-    for y in range(height * 2):
-        start = y * width
-        rows.append(pixels[start:start + width])
-    return to_terminal_frame(rows)
+    if image.size != (width, height * 2):
+        # Bilinear reads a 2x2 neighbourhood per output pixel instead of Lanczos' 6x6.
+        image = image.resize((width, height * 2), Image.BILINEAR if resample == "bilinear" else Image.LANCZOS)
+    if np is not None:
+        # (H, W, 3) uint8 straight from Pillow's buffer, no per-pixel tuples.
+        return np.asarray(image, dtype=np.uint8)
+    data = image.tobytes()
+    stride = 3 * width
+    return [array.array("B", data[start:start + stride]) for start in range(0, len(data), stride)]
+
+
+def load_image_frame(path: Path, width: int, height: int, resample: str = "lanczos") -> List[bytes]:
+    return to_terminal_frame(load_image_pixels(path, width, height, resample))
+
+
+def damage_frame(
+    prev: "np.ndarray",
+    curr: "np.ndarray",
+    max_rows: int,
+    max_cols: int,
+    palette: bool = False,
+) -> bytes:
+    """Cursor-addressed updates for just the terminal cells whose colours differ from ``prev``.
+
+    Both frames are colour keys from :func:`color_keys`, so a pixel compares as one word.
+    """
+
+    fg_code, bg_code = (PALETTE_FG.__getitem__, PALETTE_BG.__getitem__) if palette else (packed_fg, packed_bg)
+
+    changed = prev != curr
+    cells = changed[0::2].copy()
+    cells[: changed.shape[0] // 2] |= changed[1::2]
+    cells = cells[: max(max_rows, 0), : max(max_cols, 0)]
+    upper = curr[0::2]
+    lower = curr[1::2]
+    parts: List[bytes] = []
+    # SGR state survives cursor moves, so colours are tracked across the whole update.
+    fg = bg = None
+    for y in np.flatnonzero(cells.any(axis=1)).tolist():
+        top_row = upper[y].tolist()
+        bottom_row = lower[y].tolist() if y < lower.shape[0] else None
+        last_x = -2
+        for x in np.flatnonzero(cells[y]).tolist():
+            if x != last_x + 1:
+                parts.append(b"\033[%d;%dH" % (y + 1, x + 1))
+            last_x = x
+            top = top_row[x]
+            if top != fg:
+                fg = top
+                parts.append(fg_code(top))
+            if bottom_row is None:
+                parts.append(FULL_BLOCK)
+                continue
+            bottom = bottom_row[x]
+            if bottom != bg:
+                bg = bottom
+                parts.append(bg_code(bottom))
+            parts.append(UPPER_HALF)
+    if parts:
+        parts.append(RESET)
+    return b"".join(parts)
 
 
 # --------- interactive loop -------------------------------------------------
 
 class FrameSource:
-    def __init__(self, width: int, height: int, image_path: Optional[Path]) -> None:
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        image_path: Optional[Path],
+        palette: bool = False,
+        resample: str = "lanczos",
+    ) -> None:
         self.width = width
         self.height = height
+        self.palette = palette
         self.phase = 0.0
-        self.image_lines = None
+        self.image_pixels = None
         if image_path is not None:
-            self.image_lines = load_image_frame(image_path, width, height)
+            self.image_pixels = load_image_pixels(image_path, width, height, resample)
+        # What is on screen now (and at which terminal size), for damage-only redraws.
+        self.prev_pixels: Optional[Pixels] = None
+        self.prev_size: Optional[Tuple[int, int]] = None
+        self.prev_packed: Optional["np.ndarray"] = None
+        # The image never changes, so its packed lines are kept per terminal size.
+        self._image_frame: Optional[Tuple[Tuple[int, int], List[bytes]]] = None
+        # Gradient frames are filled in place, alternating between two arrays so the
+        # frame on screen (prev_pixels) is never overwritten before it is diffed against.
+        self._frames: List["np.ndarray"] = []
+        if np is not None:
+            self._frames = [np.empty((height * 2, width, 3), dtype=np.uint8) for _ in range(2)]
+
+    def image_frame(self, size: Tuple[int, int]) -> List[bytes]:
+        if self._image_frame is None or self._image_frame[0] != size:
+            assert self.image_pixels is not None
+            self._image_frame = (size, to_terminal_frame(visible_pixels(self.image_pixels, size), self.palette))
+        return self._image_frame[1]
+
+    def _back_buffer(self) -> Optional["np.ndarray"]:
+        if not self._frames:
+            return None
+        front, back = self._frames
+        return back if front is self.prev_pixels else front
+
+    def static_frame(self) -> Pixels:
+        if self.image_pixels is not None:
+            return self.image_pixels
+        return gradient_pixels(self.width, self.height * 2, 0.0, out=self._back_buffer())
+
+    def next_gradient(self, step: float = 0.02) -> Pixels:
+        self.phase = (self.phase + step) % 1.0
+        return gradient_pixels(self.width, self.height * 2, self.phase, out=self._back_buffer())
 
-    def static_frame(self) -> List[str]:
-        if self.image_lines is not None:
-            return self.image_lines
-        return gradient_frame(self.width, self.height, 0.0)
 
-    def next_gradient(self, step: float = 0.02) -> List[str]:
-        self.phase = (self.phase + step) % 1.0
-        return gradient_frame(self.width, self.height, self.phase)
+FRAME_INTERVAL = 1.0 / 24.0
+FOOTER = "[q]uit  [a]uto  [space] step  [g]radient  [i]mage  [r]eset"
 
 
-def draw_frame(stdscr: "curses._CursesWindow", lines: Sequence[str], status: str) -> None:
-    stdscr.erase()
-    max_y, max_x = stdscr.getmaxyx()
-    for idx, line in enumerate(lines):
-        if idx >= max_y - 2:
-            break
-        try:
-            stdscr.addstr(idx, 0, line)
-        except curses.error:
-            pass
-    # status/info line
-    try:
-        stdscr.addstr(max_y - 2, 0, status[: max_x - 1])
-    except curses.error:
-        pass
-    try:
-        stdscr.addstr(
-            max_y - 1,
-            0,
-            "[q]uit  [a]uto  [space] step  [g]radient  [i]mage  [r]eset"[: max_x - 1],
+def write_all(fd: int, data: bytes) -> None:
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def visible_pixels(pixels: Pixels, size: Tuple[int, int]) -> Pixels:
+    # Crop to the screen before packing: with autowrap off, cells past the edge would pile
+    # up in the last column.
+    max_rows, max_cols = 2 * max(size[0] - 2, 0), max(size[1], 0)
+    if np is not None and isinstance(pixels, np.ndarray):
+        return pixels[:max_rows, :max_cols]
+    return [row[: 3 * max_cols] if isinstance(row, array.array) else row[:max_cols] for row in pixels[:max_rows]]
+
+
+def status_bytes(max_y: int, max_x: int, status: str) -> bytes:
+    return b"".join(
+        (
+            b"\033[%d;1H" % (max_y - 1),
+            status[: max_x - 1].encode("utf-8"),
+            b"\033[K\033[%d;1H" % max_y,
+            FOOTER[: max_x - 1].encode("utf-8"),
         )
-    except curses.error:
-        pass
-    stdscr.refresh()
+    )
+
+
+def draw_frame(stdscr: "curses._CursesWindow", lines: Sequence[bytes], status: str) -> None:
+    """Write the frame plus status lines to the terminal in a single write.
+
+    curses.addstr would print the SGR escapes literally, so curses only handles input and
+    the screen size here. Autowrap is off while drawing so over-wide lines are clipped.
+    """
+
+    max_y, max_x = stdscr.getmaxyx()
+    rows = lines[: max(max_y - 2, 0)]
+    parts: List[bytes] = [b"\033[?7l"]
+    for idx, line in enumerate(rows):
+        parts += (b"\033[%d;1H" % (idx + 1), line, b"\033[K")
+    # Clear whatever the previous frame left below this one, then redraw the footer.
+    parts += (b"\033[%d;1H\033[J" % (len(rows) + 1), status_bytes(max_y, max_x, status), b"\033[?7h")
+    write_all(sys.stdout.fileno(), b"".join(parts))
+
+
+def present(stdscr: "curses._CursesWindow", source: FrameSource, pixels: Pixels, status: str) -> None:
+    """Show ``pixels``, redrawing only changed cells when the previous frame is comparable."""
+
+    size = stdscr.getmaxyx()
+    packed = color_keys(pixels, source.palette) if np is not None and isinstance(pixels, np.ndarray) else None
+    prev = source.prev_packed
+    if packed is not None and prev is not None and prev.shape == packed.shape and size == source.prev_size:
+        max_y, max_x = size
+        payload = damage_frame(prev, packed, max_y - 2, max_x, source.palette)
+        write_all(sys.stdout.fileno(), b"".join((payload, status_bytes(max_y, max_x, status))))
+    elif pixels is source.image_pixels:
+        draw_frame(stdscr, source.image_frame(size), status)
+    else:
+        draw_frame(stdscr, to_terminal_frame(visible_pixels(pixels, size), source.palette), status)
+    source.prev_pixels = pixels
+    source.prev_packed = packed
+    source.prev_size = size
 
 
 def interactive_loop(stdscr: "curses._CursesWindow", source: FrameSource, auto: bool) -> None:
     curses.curs_set(0)
     stdscr.nodelay(True)
-    if supports_truecolor():
-        status_color = "Truecolor OK"
+    # Flush curses' own screen setup now; frames bypass it, so getch() never repaints.
+    stdscr.refresh()
+    if not source.palette:
+        status_color = "Truecolor"
+    elif supports_truecolor():
+        status_color = "256 colours (forced)"
     else:
-        status_color = "Truecolor uncertain (COLORTERM missing)"
+        status_color = "256 colours (COLORTERM lacks truecolor)"
 
-    mode = "image" if source.image_lines is not None else "gradient"
+    mode = "image" if source.image_pixels is not None else "gradient"
     current = source.static_frame() if mode == "image" else source.next_gradient(step=0.0)
-    draw_frame(stdscr, current, f"Mode: {mode} | Auto: {auto} | {status_color}")
+    present(stdscr, source, current, f"Mode: {mode} | Auto: {auto} | {status_color}")
 
-    last_frame_at = time.time()
+    next_frame_at = time.monotonic() + FRAME_INTERVAL
 
     while True:
-        now = time.time()
-        if auto and mode == "gradient" and now - last_frame_at >= 1.0 / 24.0:
+        now = time.monotonic()
+        animating = auto and mode == "gradient"
+        if animating and now >= next_frame_at:
             current = source.next_gradient()
-            last_frame_at = now
-            draw_frame(stdscr, current, f"Mode: gradient | Auto: {auto} | {status_color}")
+            # Hold a fixed cadence; after a stall, restart it instead of bursting frames.
+            next_frame_at += FRAME_INTERVAL
+            if next_frame_at < now:
+                next_frame_at = now + FRAME_INTERVAL
+            present(stdscr, source, current, f"Mode: gradient | Auto: {auto} | {status_color}")
 
         ch = stdscr.getch()
         if ch == -1:
-            time.sleep(0.01)
+            # Sleep until a key arrives or the next frame is due; idle screens block outright.
+            timeout = max(0.0, next_frame_at - time.monotonic()) if animating else None
+            select.select([sys.stdin], [], [], timeout)
             continue
         if ch in (ord("q"), ord("Q")):
             break
         if ch in (ord("a"), ord("A")):
             auto = not auto
-            draw_frame(stdscr, current, f"Mode: {mode} | Auto: {auto} | {status_color}")
+            present(stdscr, source, current, f"Mode: {mode} | Auto: {auto} | {status_color}")
         elif ch == ord(" "):
             if mode == "gradient":
                 current = source.next_gradient(step=0.05)
-                last_frame_at = now
-                draw_frame(stdscr, current, f"Mode: gradient | Auto: {auto} | {status_color}")
+                next_frame_at = now + FRAME_INTERVAL
+                present(stdscr, source, current, f"Mode: gradient | Auto: {auto} | {status_color}")
         elif ch in (ord("g"), ord("G")):
             mode = "gradient"
             current = source.next_gradient(step=0.0)
-            last_frame_at = now
-            draw_frame(stdscr, current, f"Mode: gradient | Auto: {auto} | {status_color}")
+            next_frame_at = now + FRAME_INTERVAL
+            present(stdscr, source, current, f"Mode: gradient | Auto: {auto} | {status_color}")
         elif ch in (ord("i"), ord("I")):
-            if source.image_lines is not None:
+            if source.image_pixels is not None:
                 mode = "image"
                 current = source.static_frame()
-                draw_frame(stdscr, current, f"Mode: image | Auto: {auto} | {status_color}")
+                present(stdscr, source, current, f"Mode: image | Auto: {auto} | {status_color}")
         elif ch in (ord("r"), ord("R")):
             source.phase = 0.0
             current = source.static_frame() if mode == "image" else source.next_gradient(step=0.0)
-            last_frame_at = now
-            draw_frame(stdscr, current, f"Mode: {mode} | Auto: {auto} | {status_color}")
+            next_frame_at = now + FRAME_INTERVAL
+            present(stdscr, source, current, f"Mode: {mode} | Auto: {auto} | {status_color}")
 
 
 # --------- entrypoint -------------------------------------------------------
@@ -199,13 +463,29 @@ def main() -> int:
     parser.add_argument("--width", type=int, default=80, help="Frame width (columns)")
     parser.add_argument("--height", type=int, default=24, help="Frame height (terminal lines)")
     parser.add_argument("--animate", action="store_true", help="Start in auto gradient mode")
+    parser.add_argument(
+        "--colors",
+        choices=("auto", "truecolor", "256"),
+        default="auto",
+        help="Colour depth; auto uses truecolor only when COLORTERM advertises it",
+    )
+    parser.add_argument(
+        "--resample",
+        choices=RESAMPLE,
+        default="lanczos",
+        help="Image scaling filter; bilinear is much cheaper on slow CPUs",
+    )
     args = parser.parse_args()
 
     image_path = Path(args.path).expanduser() if args.path else None
     if image_path is not None and not image_path.exists():
         parser.error(f"Image not found: {image_path}")
 
-    source = FrameSource(args.width, args.height, image_path)
+    if args.colors == "auto":
+        palette = not supports_truecolor()
+    else:
+        palette = args.colors == "256"
+    source = FrameSource(args.width, args.height, image_path, palette, args.resample)
 
     try:
         curses.wrapper(interactive_loop, source, args.animate)
@@ -1,8 +1,16 @@
 #!/usr/bin/env python3
 import argparse
+import mmap
+import os
 import struct
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - optional dependency
+    np = None  # type: ignore
+
 GGUF_TYPE_SIZES = {
     0: 1,  # u8
     1: 1,  # i8
@@ -23,58 +31,124 @@ QK_K = 256
 K_SCALE_SIZE = 12
 BLOCK_Q4_K_BYTES = 2 + 2 + K_SCALE_SIZE + (QK_K // 2)  # d + dmin + scales + qs
 
+# Each qs byte expands to two signed int8 bytes (low nibble first), stored as uint8.
+NIBBLE_LUT = [bytes((((b & 0x0F) - 8) & 0xFF, ((b >> 4) - 8) & 0xFF)) for b in range(256)]
+
+
+U32 = struct.Struct("<I")
+U64 = struct.Struct("<Q")
+
 
-def read_u32(f):
-    return struct.unpack("<I", f.read(4))[0]
+class HeaderCursor:
+    # Walks the mapped header with precompiled structs; no read() per field.
+    def __init__(self, buf, pos=0):
+        self.buf = buf
+        self.pos = pos
 
+    def read_u32(self):
+        value = U32.unpack_from(self.buf, self.pos)[0]
+        self.pos += 4
+        return value
 
-def read_u64(f):
-    return struct.unpack("<Q", f.read(8))[0]
+    def read_u64(self):
+        value = U64.unpack_from(self.buf, self.pos)[0]
+        self.pos += 8
+        return value
 
+    def read_str(self, decode=True):
+        n = self.read_u64()
+        data = self.buf[self.pos:self.pos + n]
+        self.pos += n
+        return data.decode("utf-8") if decode else data
 
-def read_str(f):
-    n = read_u64(f)
-    data = f.read(n)
-    return data.decode("utf-8")
+    def skip_str(self):
+        n = self.read_u64()
+        self.pos += n
 
 
-def skip_kv(f, n_kv):
+def skip_kv(cur, n_kv):
     alignment = 32
     for _ in range(n_kv):
-        key = read_str(f)
-        vtype = read_u32(f)
+        key = cur.read_str(decode=False)
+        vtype = cur.read_u32()
         if vtype == 8:  # string
-            _ = read_str(f)
+            cur.skip_str()
         elif vtype == 9:  # array
-            atype = read_u32(f)
-            n = read_u64(f)
+            atype = cur.read_u32()
+            n = cur.read_u64()
             if atype == 8:  # string array
                 for _ in range(n):
-                    _ = read_str(f)
+                    cur.skip_str()
             else:
                 size = GGUF_TYPE_SIZES.get(atype, 0)
-                f.seek(size * n, 1)
+                cur.pos += size * n
         else:
             size = GGUF_TYPE_SIZES.get(vtype, 0)
-            if key == "general.alignment" and vtype == 4:
-                alignment = struct.unpack("<I", f.read(4))[0]
+            if key == b"general.alignment" and vtype == 4:
+                alignment = cur.read_u32()
             else:
-                f.seek(size, 1)
+                cur.pos += size
     return alignment
 
 
-def read_tensor_meta(f, n_tensors):
+def read_tensor_meta(cur, n_tensors):
+    # Names stay raw bytes; callers match on bytes and decode only what they print.
     tensors = []
     for _ in range(n_tensors):
-        name = read_str(f)
-        n_dims = read_u32(f)
-        dims = [read_u64(f) for _ in range(n_dims)]
-        ttype = read_u32(f)
-        offset = read_u64(f)
+        name = cur.read_str(decode=False)
+        n_dims = cur.read_u32()
+        dims = [cur.read_u64() for _ in range(n_dims)]
+        ttype = cur.read_u32()
+        offset = cur.read_u64()
         tensors.append((name, dims, ttype, offset))
     return tensors
 
 
+def unpack_q4k_np(mm, base, rows, row_bytes, row_blocks, workers=1):
+    # Strided view over the qs bytes of every selected block, expanded into
+    # (rows, row_blocks, QK_K) int8.
+    blocks = np.frombuffer(mm, dtype=np.uint8, count=rows * row_bytes, offset=base)
+    qs = blocks.reshape(rows, -1, BLOCK_Q4_K_BYTES)[:, :row_blocks, 4 + K_SCALE_SIZE:]
+    # (..., QK_K // 2, 2) pairs each qs byte with its two outputs: lo nibble, then hi.
+    pairs = np.empty((rows, row_blocks, QK_K // 2, 2), dtype=np.uint8)
+
+    def fill(span):
+        # In-place ufuncs release the GIL and allocate nothing; uint8 wraparound on
+        # "-= 8" is the int8 two's-complement result.
+        dst = pairs[span[0]:span[1]]
+        src = qs[span[0]:span[1]]
+        np.bitwise_and(src, 0x0F, out=dst[..., 0])
+        np.right_shift(src, 4, out=dst[..., 1])
+        dst -= 8
+
+    step = max(1, -(-rows // max(1, workers)))
+    spans = [(r, min(r + step, rows)) for r in range(0, rows, step)]
+    if len(spans) > 1:
+        # Each worker owns a disjoint row range of the shared output.
+        with ThreadPoolExecutor(len(spans)) as pool:
+            list(pool.map(fill, spans))
+    else:
+        fill((0, rows))
+    return pairs.view(np.int8).reshape(rows, row_blocks, QK_K)
+
+
+def unpack_q4k_py(mm, base, rows, row_bytes, row_blocks, workers=1):
+    qs_start = base + 4 + K_SCALE_SIZE
+    if row_blocks * BLOCK_Q4_K_BYTES == row_bytes:
+        # Whole rows selected: the blocks form one contiguous run, no per-row offsets.
+        offsets = range(qs_start, base + rows * row_bytes, BLOCK_Q4_K_BYTES)
+    else:
+        offsets = (
+            qs_start + r * row_bytes + blk * BLOCK_Q4_K_BYTES
+            for r in range(rows)
+            for blk in range(row_blocks)
+        )
+    buf = bytearray()
+    for qs_off in offsets:
+        buf += b"".join([NIBBLE_LUT[b] for b in mm[qs_off:qs_off + QK_K // 2]])
+    return buf
+
+
 def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("model")
@@ -82,26 +156,33 @@ def main():
     ap.add_argument("--rows", type=int, default=None)
     ap.add_argument("--cols", type=int, default=None)
     ap.add_argument("--out", required=True, help="output .bin path")
+    ap.add_argument(
+        "--threads",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="worker threads for the NumPy unpack (default: all cores)",
+    )
     args = ap.parse_args()
 
     path = Path(args.model)
-    with path.open("rb") as f:
-        magic = f.read(4)
-        if magic != b"GGUF":
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if mm[:4] != b"GGUF":
             raise SystemExit("not a GGUF file")
-        version = read_u32(f)
-        n_tensors = read_u64(f)
-        n_kv = read_u64(f)
-        alignment = skip_kv(f, n_kv)
-        tensors = read_tensor_meta(f, n_tensors)
-        data_offset = f.tell()
+        cur = HeaderCursor(mm, 4)
+        version = cur.read_u32()
+        n_tensors = cur.read_u64()
+        n_kv = cur.read_u64()
+        alignment = skip_kv(cur, n_kv)
+        tensors = read_tensor_meta(cur, n_tensors)
+        data_offset = cur.pos
         if data_offset % alignment != 0:
             data_offset += alignment - (data_offset % alignment)
 
     match = None
+    needle = args.tensor.encode("utf-8")
     for name, dims, ttype, offset in tensors:
-        if args.tensor in name:
-            match = (name, dims, ttype, offset)
+        if needle in name:
+            match = (name.decode("utf-8"), dims, ttype, offset)
             break
     if not match:
         raise SystemExit(f"tensor not found: {args.tensor}")
@@ -128,21 +209,16 @@ def main():
     row_bytes = row_blocks_total * BLOCK_Q4_K_BYTES
 
     out_path = Path(args.out)
-    with path.open("rb") as f, out_path.open("wb") as out:
+    unpack = unpack_q4k_np if np is not None else unpack_q4k_py
+    # Map the file once and slice blocks out of it instead of seek+read per block.
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
         base = data_offset + offset
-        for r in range(rows):
-            row_off = base + r * row_bytes
-            f.seek(row_off)
-            for _ in range(row_blocks):
-                block = f.read(BLOCK_Q4_K_BYTES)
-                if len(block) != BLOCK_Q4_K_BYTES:
-                    raise SystemExit("unexpected EOF")
-                qs = block[4 + K_SCALE_SIZE:]
-                for b in qs:
-                    lo = (b & 0x0F) - 8
-                    hi = (b >> 4) - 8
-                    out.write(struct.pack("b", lo))
-                    out.write(struct.pack("b", hi))
+        if base + rows * row_bytes > len(mm):
+            raise SystemExit("unexpected EOF")
+        data = unpack(mm, base, rows, row_bytes, row_blocks, args.threads)
+
+    with out_path.open("wb") as out:
+        out.write(memoryview(data))
 
     print(f"wrote {out_path} rows={rows} cols={cols} tensor={name} version={version}")
 
@@ -1,5 +1,6 @@
 #!/usr/bin/env python3
 import argparse
+import mmap
 import struct
 from collections import Counter
 from pathlib import Path
@@ -56,53 +57,71 @@ GGUF_TYPE_SIZES = {
 }
 
 
-def read_u32(f):
-    return struct.unpack("<I", f.read(4))[0]
+U32 = struct.Struct("<I")
+U64 = struct.Struct("<Q")
 
 
-def read_u64(f):
-    return struct.unpack("<Q", f.read(8))[0]
+class HeaderCursor:
+    # Walks the mapped header with precompiled structs; no read() per field.
+    def __init__(self, buf, pos=0):
+        self.buf = buf
+        self.pos = pos
 
+    def read_u32(self):
+        value = U32.unpack_from(self.buf, self.pos)[0]
+        self.pos += 4
+        return value
 
-def read_str(f):
-    n = read_u64(f)
-    data = f.read(n)
-    return data.decode("utf-8")
+    def read_u64(self):
+        value = U64.unpack_from(self.buf, self.pos)[0]
+        self.pos += 8
+        return value
 
+    def read_str(self, decode=True):
+        n = self.read_u64()
+        data = self.buf[self.pos:self.pos + n]
+        self.pos += n
+        return data.decode("utf-8") if decode else data
 
-def skip_kv(f, n_kv):
+    def skip_str(self):
+        n = self.read_u64()
+        self.pos += n
+
+
+def skip_kv(cur, n_kv):
     alignment = 32
     for _ in range(n_kv):
-        key = read_str(f)
-        vtype = read_u32(f)
+        key = cur.read_str(decode=False)
+        vtype = cur.read_u32()
         if vtype == 8:  # string
-            _ = read_str(f)
+            cur.skip_str()
         elif vtype == 9:  # array
-            atype = read_u32(f)
-            n = read_u64(f)
+            atype = cur.read_u32()
+            n = cur.read_u64()
             if atype == 8:  # string array
                 for _ in range(n):
-                    _ = read_str(f)
+                    cur.skip_str()
             else:
                 size = GGUF_TYPE_SIZES.get(atype, 0)
-                f.seek(size * n, 1)
+                cur.pos += size * n
         else:
             size = GGUF_TYPE_SIZES.get(vtype, 0)
-            if key == "general.alignment" and vtype == 4:
-                alignment = struct.unpack("<I", f.read(4))[0]
+            if key == b"general.alignment" and vtype == 4:
+                alignment = cur.read_u32()
             else:
-                f.seek(size, 1)
+                cur.pos += size
     return alignment
 
 
-def read_tensor_meta(f, n_tensors):
+def read_tensor_meta(cur, n_tensors):
+    # Names stay raw bytes; callers match on bytes and decode only what they print.
     tensors = []
     for _ in range(n_tensors):
-        name = read_str(f)
-        n_dims = read_u32(f)
-        dims = [read_u64(f) for _ in range(n_dims)]
-        ttype = read_u32(f)
-        offset = read_u64(f)
+        name = cur.read_str(decode=False)
+        n_dims = cur.read_u32()
+        dims = [cur.read_u64() for _ in range(n_dims)]
+        ttype = cur.read_u32()
+        offset = cur.read_u64()
         tensors.append((name, dims, ttype, offset))
     return tensors
 
@@ -115,15 +134,15 @@ def main():
     args = ap.parse_args()
 
     path = Path(args.model)
-    with path.open("rb") as f:
-        magic = f.read(4)
-        if magic != b"GGUF":
+    with path.open("rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        if mm[:4] != b"GGUF":
             raise SystemExit("not a GGUF file")
-        version = read_u32(f)
-        n_tensors = read_u64(f)
-        n_kv = read_u64(f)
-        alignment = skip_kv(f, n_kv)
-        tensors = read_tensor_meta(f, n_tensors)
+        cur = HeaderCursor(mm, 4)
+        version = cur.read_u32()
+        n_tensors = cur.read_u64()
+        n_kv = cur.read_u64()
+        alignment = skip_kv(cur, n_kv)
+        tensors = read_tensor_meta(cur, n_tensors)
 
     counts = Counter()
     for name, dims, ttype, _ in tensors:
@@ -136,10 +155,11 @@ def main():
 
     print("\nfirst tensors:")
     shown = 0
+    needle = args.filter.encode("utf-8") if args.filter else None
     for name, dims, ttype, _ in tensors:
-        if args.filter and args.filter not in name:
+        if needle and needle not in name:
             continue
-        print(f"  {name} type={GGML_TYPES.get(ttype, str(ttype))} dims={list(dims)}")
+        print(f"  {name.decode('utf-8')} type={GGML_TYPES.get(ttype, str(ttype))} dims={list(dims)}")
         shown += 1
         if shown >= args.limit:
             break
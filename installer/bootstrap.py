@@ -8,6 +8,9 @@ installs a shim on PATH. It relies on the manifest produced during release.
 from __future__ import annotations
 
 import argparse
+import contextlib
+import errno
+import functools
 import hashlib
 import json
 import os
@@ -18,168 +21,226 @@ import tarfile
 import tempfile
 from pathlib import Path
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, BinaryIO, Callable, Dict, Iterator, Optional, Tuple
 from urllib.parse import urlparse
 from urllib.request import urlopen
 import zipfile
 
 REPO_ROOT = Path(__file__).resolve().parents[1]
 CORE_ROOT = REPO_ROOT / "core"
-for candidate in (REPO_ROOT, CORE_ROOT):
-    if candidate.exists() and str(candidate) not in sys.path:
-        sys.path.insert(0, str(candidate))
-
-try:  # pragma: no cover - optional when bootstrap is fetched standalone
-    from noctics_cli.paths import bin_dir, install_home, config_home  # type: ignore  # noqa: E402
-    from noctics_cli.setup import ensure_global_config_home  # type: ignore  # noqa: E402
-    from noctics_cli.metrics import record_install_event  # type: ignore  # noqa: E402
-except Exception:  # pragma: no cover
-    def _env_path(name: str) -> Optional[Path]:
-        value = os.getenv(name)
-        if not value:
-            return None
-        return Path(value).expanduser()
-
-    def config_home() -> Path:
-        override = _env_path("NOCTICS_CONFIG_HOME")
-        if override:
-            return override
-
-        home = Path.home()
-        if sys.platform == "win32":
-            base = Path(os.getenv("APPDATA", home / "AppData" / "Roaming"))
-            return base / "Noctics"
-        if sys.platform == "darwin":
-            base = home / "Library" / "Application Support"
-            return base / "Noctics"
-        base = Path(os.getenv("XDG_CONFIG_HOME", home / ".config"))
-        return base / "noctics"
-
-    def install_home() -> Path:
-        override = _env_path("NOCTICS_INSTALL_HOME")
-        if override:
-            return override
-
-        home = Path.home()
-        if sys.platform == "win32":
-            base = Path(os.getenv("LOCALAPPDATA", home / "AppData" / "Local"))
-            return base / "Noctics"
-        if sys.platform == "darwin":
-            base = home / "Library" / "Application Support"
-            return base / "Noctics" / "Runtime"
-        base = Path(os.getenv("XDG_DATA_HOME", home / ".local" / "share"))
-        return base / "noctics"
-
-    def bin_dir() -> Path:
-        override = _env_path("NOCTICS_BIN_DIR")
-        if override:
-            return override
-
-        home = Path.home()
-        if sys.platform == "win32":
-            base = Path(os.getenv("LOCALAPPDATA", home / "AppData" / "Local"))
-            return base / "Noctics" / "bin"
-        return home / ".local" / "bin"
-
-    def ensure_global_config_home() -> tuple[Path, Path, Path]:
-        root = config_home()
-        root.mkdir(parents=True, exist_ok=True)
-        config_path = root / "central.json"
-        secrets_path = root / "secrets.env"
-        os.environ.setdefault("NOCTICS_CONFIG_HOME", str(root))
-        os.environ.setdefault("NOX_CONFIG", str(config_path))
-        os.environ.setdefault("NOCTICS_SECRETS_FILE", str(secrets_path))
-        return root, config_path, secrets_path
-
-    def _load_metrics(metrics_path: Path) -> Dict[str, Any]:
-        if not metrics_path.exists():
-            return {}
-        try:
-            raw = metrics_path.read_text(encoding="utf-8")
-        except OSError:
-            return {}
-        if not raw.strip():
-            return {}
-        try:
-            data = json.loads(raw)
-        except json.JSONDecodeError:
-            return {}
-        return data if isinstance(data, dict) else {}
 
-    def _dump_metrics(metrics_path: Path, data: Dict[str, Any]) -> None:
-        tmp_path = metrics_path.with_suffix(".tmp")
-        try:
-            tmp_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
-            tmp_path.replace(metrics_path)
-        except OSError:
-            tmp_path.unlink(missing_ok=True)
-
-    def record_install_event(
-        memory_root: Path,
-        *,
-        version: str,
-        slug: str,
-        build: Optional[str] = None,
-        now: datetime | None = None,
-    ) -> None:
-        metrics_dir = memory_root / "telemetry"
-        metrics_dir.mkdir(parents=True, exist_ok=True)
-        metrics_path = metrics_dir / "metrics.json"
-
-        data = _load_metrics(metrics_path)
-        installs = data.get("installs")
-        if not isinstance(installs, dict):
-            installs = {}
-
-        total = int(installs.get("total") or 0) + 1
-        per_version = installs.get("per_version")
-        if not isinstance(per_version, dict):
-            per_version = {}
-        version_key = str(version)
-        per_version[version_key] = int(per_version.get(version_key) or 0) + 1
-
-        per_slug = installs.get("per_slug")
-        if not isinstance(per_slug, dict):
-            per_slug = {}
-        slug_key = str(slug)
-        per_slug[slug_key] = int(per_slug.get(slug_key) or 0) + 1
-
-        now = now or datetime.now(timezone.utc)
-        event: Dict[str, str] = {
-            "time": now.isoformat(),
-            "version": version_key,
-            "slug": slug_key,
+
+def _ensure_paths() -> None:
+    """Make a source checkout's ``noctics_cli`` and core packages importable."""
+
+    for candidate in (REPO_ROOT, CORE_ROOT):
+        if candidate.exists() and str(candidate) not in sys.path:
+            sys.path.insert(0, str(candidate))
+
+
+# Standalone copies of the noctics_cli helpers, for when bootstrap is fetched on its own.
+def _env_path(name: str) -> Optional[Path]:
+    value = os.getenv(name)
+    if not value:
+        return None
+    return Path(value).expanduser()
+
+
+def _standalone_config_home() -> Path:
+    override = _env_path("NOCTICS_CONFIG_HOME")
+    if override:
+        return override
+
+    home = Path.home()
+    if sys.platform == "win32":
+        base = Path(os.getenv("APPDATA", home / "AppData" / "Roaming"))
+        return base / "Noctics"
+    if sys.platform == "darwin":
+        base = home / "Library" / "Application Support"
+        return base / "Noctics"
+    base = Path(os.getenv("XDG_CONFIG_HOME", home / ".config"))
+    return base / "noctics"
+
+
+def _standalone_install_home() -> Path:
+    override = _env_path("NOCTICS_INSTALL_HOME")
+    if override:
+        return override
+
+    home = Path.home()
+    if sys.platform == "win32":
+        base = Path(os.getenv("LOCALAPPDATA", home / "AppData" / "Local"))
+        return base / "Noctics"
+    if sys.platform == "darwin":
+        base = home / "Library" / "Application Support"
+        return base / "Noctics" / "Runtime"
+    base = Path(os.getenv("XDG_DATA_HOME", home / ".local" / "share"))
+    return base / "noctics"
+
+
+def _standalone_bin_dir() -> Path:
+    override = _env_path("NOCTICS_BIN_DIR")
+    if override:
+        return override
+
+    home = Path.home()
+    if sys.platform == "win32":
+        base = Path(os.getenv("LOCALAPPDATA", home / "AppData" / "Local"))
+        return base / "Noctics" / "bin"
+    return home / ".local" / "bin"
+
+
+def _standalone_ensure_global_config_home() -> tuple[Path, Path, Path]:
+    root = _standalone_config_home()
+    root.mkdir(parents=True, exist_ok=True)
+    config_path = root / "central.json"
+    secrets_path = root / "secrets.env"
+    os.environ.setdefault("NOCTICS_CONFIG_HOME", str(root))
+    os.environ.setdefault("NOX_CONFIG", str(config_path))
+    os.environ.setdefault("NOCTICS_SECRETS_FILE", str(secrets_path))
+    return root, config_path, secrets_path
+
+
+def _load_metrics(metrics_path: Path) -> Dict[str, Any]:
+    if not metrics_path.exists():
+        return {}
+    try:
+        raw = metrics_path.read_text(encoding="utf-8")
+    except OSError:
+        return {}
+    if not raw.strip():
+        return {}
+    try:
+        data = json.loads(raw)
+    except json.JSONDecodeError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _dump_metrics(metrics_path: Path, data: Dict[str, Any]) -> None:
+    tmp_path = metrics_path.with_suffix(".tmp")
+    try:
+        tmp_path.write_text(json.dumps(data, indent=2), encoding="utf-8")
+        tmp_path.replace(metrics_path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _standalone_record_install_event(
+    memory_root: Path,
+    *,
+    version: str,
+    slug: str,
+    build: Optional[str] = None,
+    now: datetime | None = None,
+) -> None:
+    metrics_dir = memory_root / "telemetry"
+    metrics_dir.mkdir(parents=True, exist_ok=True)
+    metrics_path = metrics_dir / "metrics.json"
+
+    data = _load_metrics(metrics_path)
+    installs = data.get("installs")
+    if not isinstance(installs, dict):
+        installs = {}
+
+    total = int(installs.get("total") or 0) + 1
+    per_version = installs.get("per_version")
+    if not isinstance(per_version, dict):
+        per_version = {}
+    version_key = str(version)
+    per_version[version_key] = int(per_version.get(version_key) or 0) + 1
+
+    per_slug = installs.get("per_slug")
+    if not isinstance(per_slug, dict):
+        per_slug = {}
+    slug_key = str(slug)
+    per_slug[slug_key] = int(per_slug.get(slug_key) or 0) + 1
+
+    now = now or datetime.now(timezone.utc)
+    event: Dict[str, str] = {
+        "time": now.isoformat(),
+        "version": version_key,
+        "slug": slug_key,
+    }
+    if build:
+        event["build"] = build
+
+    history = installs.get("history")
+    if isinstance(history, list):
+        history = history + [event]
+        history = history[-200:]
+    else:
+        history = [event]
+
+    installs.update(
+        {
+            "total": total,
+            "last": event,
+            "per_version": per_version,
+            "per_slug": per_slug,
+            "history": history,
         }
-        if build:
-            event["build"] = build
+    )
 
-        history = installs.get("history")
-        if isinstance(history, list):
-            history = history + [event]
-            history = history[-200:]
-        else:
-            history = [event]
-
-        installs.update(
-            {
-                "total": total,
-                "last": event,
-                "per_version": per_version,
-                "per_slug": per_slug,
-                "history": history,
-            }
-        )
+    data["installs"] = installs
+    _dump_metrics(metrics_path, data)
+
+
+@functools.lru_cache(maxsize=None)
+def _cli() -> Dict[str, Callable[..., Any]]:
+    """Import the noctics_cli helpers on first use, so ``--help`` never pays for them."""
+
+    _ensure_paths()
+    try:  # pragma: no cover - optional when bootstrap is fetched standalone
+        from noctics_cli.paths import bin_dir, install_home, config_home  # type: ignore
+        from noctics_cli.setup import ensure_global_config_home  # type: ignore
+        from noctics_cli.metrics import record_install_event  # type: ignore
+    except Exception:  # pragma: no cover
+        bin_dir = _standalone_bin_dir
+        install_home = _standalone_install_home
+        config_home = _standalone_config_home
+        ensure_global_config_home = _standalone_ensure_global_config_home
+        record_install_event = _standalone_record_install_event
+    return {
+        "bin_dir": bin_dir,
+        "install_home": install_home,
+        "config_home": config_home,
+        "ensure_global_config_home": ensure_global_config_home,
+        "record_install_event": record_install_event,
+    }
 
-        data["installs"] = installs
-        _dump_metrics(metrics_path, data)
 
-try:  # pragma: no cover - optional dependency when core isn't bundled with bootstrapper
-    from interfaces.paths import resolve_memory_root as _core_resolve_memory_root  # type: ignore  # noqa: E402
-except Exception:  # pragma: no cover
-    _core_resolve_memory_root = None  # type: ignore
+def config_home() -> Path:
+    return _cli()["config_home"]()
+
+
+def install_home() -> Path:
+    return _cli()["install_home"]()
+
+
+def bin_dir() -> Path:
+    return _cli()["bin_dir"]()
+
+
+def ensure_global_config_home() -> tuple[Path, Path, Path]:
+    return _cli()["ensure_global_config_home"]()
+
+
+def record_install_event(memory_root: Path, *, version: str, slug: str, build: Optional[str] = None) -> None:
+    _cli()["record_install_event"](memory_root, version=version, slug=slug, build=build)
+
 
 DEFAULT_MANIFEST_URL = "https://github.com/noctics/noctics/releases/latest/download/installer_manifest.json"
 ARCHIVE_TYPES = {".zip": "zip", ".tar.gz": "tar", ".tgz": "tar", ".tar": "tar"}
+INSTALL_STATE_FILE = ".noctics_install_state.json"
+STREAM_CHUNK_SIZE = 1024 * 1024
+# Archives at least this large are fetched as parallel byte ranges when the server allows it.
+RANGE_MIN_SIZE = 16 * 1024 * 1024
+RANGE_WORKERS = 8
+# Bytes per os.copy_file_range() call; the kernel copies without a userspace buffer.
+COPY_RANGE_SIZE = 1 << 24
+# copy_file_range() errors that mean "not supported here", not a failed copy.
+_COPY_RANGE_UNSUPPORTED = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EPERM}
 
 
 def detect_platform_slug() -> str:
@@ -210,41 +271,221 @@ def platform_machine() -> str:
     return platform.machine()
 
 
+@functools.lru_cache(maxsize=None)
+def _http_pool() -> Optional[Any]:
+    """Shared keep-alive pool, so the archive download reuses the manifest's connection."""
+
+    try:  # pragma: no cover - optional dependency; urllib.request is used without it
+        import urllib3  # type: ignore
+    except Exception:  # pragma: no cover
+        return None
+    retries = urllib3.Retry(total=5, redirect=5, backoff_factor=0.5, status_forcelist=(502, 503, 504))
+    return urllib3.PoolManager(maxsize=RANGE_WORKERS, retries=retries)
+
+
 def read_manifest(manifest_ref: str) -> Dict[str, Any]:
     parsed = urlparse(manifest_ref)
     if parsed.scheme in {"", "file"}:
         path = Path(parsed.path or manifest_ref).expanduser()
         return json.loads(path.read_text(encoding="utf-8"))
+    pool = _http_pool()
+    if pool is not None:
+        resp = pool.request("GET", manifest_ref)
+        if resp.status >= 400:
+            raise RuntimeError(f"Failed to fetch manifest {manifest_ref}: HTTP {resp.status}")
+        return json.loads(resp.data)
     with urlopen(manifest_ref) as resp:  # nosec - controlled release URL
         data = resp.read().decode(resp.headers.get_content_charset() or "utf-8")
     return json.loads(data)
 
 
-def download_file(url: str, dest: Path) -> None:
+class HashingReader:
+    """Read-only stream wrapper that SHA-256 hashes (and optionally tees) every byte read."""
+
+    def __init__(self, inner: BinaryIO, sink: Optional[BinaryIO] = None) -> None:
+        self._inner = inner
+        self._sink = sink
+        self._digest = hashlib.sha256()
+
+    def read(self, size: int = -1) -> bytes:
+        data = self._inner.read(size)
+        if data:
+            self._digest.update(data)
+            if self._sink is not None:
+                self._sink.write(data)
+        return data
+
+    def drain(self) -> None:
+        """Consume the rest of the stream so the digest covers all of it."""
+
+        # One reused buffer: no per-chunk bytes objects on multi-hundred-MB downloads.
+        buf = bytearray(STREAM_CHUNK_SIZE)
+        view = memoryview(buf)
+        while True:
+            n = self._inner.readinto(buf)  # type: ignore[attr-defined]
+            if not n:
+                break
+            chunk = view[:n]
+            self._digest.update(chunk)
+            if self._sink is not None:
+                self._sink.write(chunk)
+
+    def hexdigest(self) -> str:
+        return self._digest.hexdigest()
+
+
+def _local_path(url: str) -> Optional[Path]:
     parsed = urlparse(url)
     if parsed.scheme in {"", "file"}:
-        src = Path(parsed.path or url).expanduser()
-        shutil.copy(src, dest)
+        return Path(parsed.path or url).expanduser()
+    return None
+
+
+@contextlib.contextmanager
+def open_source(url: str) -> Iterator[BinaryIO]:
+    local = _local_path(url)
+    if local is not None:
+        with local.open("rb") as fh:
+            yield fh
+        return
+    pool = _http_pool()
+    if pool is None:
+        with urlopen(url) as resp:  # nosec - release download
+            yield resp
         return
-    with urlopen(url) as resp:  # nosec - release download
-        with dest.open("wb") as fh:
-            shutil.copyfileobj(resp, fh)
+    # Raw bytes only: a Content-Encoding must not be undone before the checksum.
+    resp = pool.request("GET", url, preload_content=False, decode_content=False)
+    try:
+        if resp.status >= 400:
+            raise RuntimeError(f"Failed to download {url}: HTTP {resp.status}")
+        yield resp  # type: ignore[misc]
+    except BaseException:
+        resp.close()
+        raise
+    # Fully read by the caller, so the connection can go back to the pool.
+    resp.release_conn()
+
+
+def _ranged_length(url: str) -> Optional[int]:
+    """Return the size of ``url`` if it should be fetched as parallel ranges, else None."""
+
+    pool = _http_pool()
+    if pool is None or not hasattr(os, "pwrite") or urlparse(url).scheme not in {"http", "https"}:
+        return None
+    try:
+        resp = pool.request("HEAD", url)
+    except Exception:
+        return None
+    headers = resp.headers
+    if resp.status >= 400 or headers.get("Accept-Ranges", "").lower() != "bytes" or headers.get("Content-Encoding"):
+        return None
+    try:
+        size = int(headers.get("Content-Length", ""))
+    except ValueError:
+        return None
+    return size if size >= RANGE_MIN_SIZE else None
+
+
+def _download_ranges(url: str, dest: Path, size: int) -> str:
+    """Fetch ``size`` bytes of ``url`` into ``dest`` over concurrent range requests.
+
+    Each worker writes its span at its own offset in the pre-sized file; the file is
+    hashed in one pass once every range has landed. Returns the SHA-256.
+    """
+
+    pool = _http_pool()
+    span = -(-size // RANGE_WORKERS)
+    with dest.open("wb") as fh:
+        fd = fh.fileno()
+        try:
+            os.posix_fallocate(fd, 0, size)  # type: ignore[attr-defined]
+        except (AttributeError, OSError):
+            fh.truncate(size)
+
+        def fetch(lo: int) -> None:
+            hi = min(lo + span, size)
+            headers = {"Range": f"bytes={lo}-{hi - 1}"}
+            resp = pool.request("GET", url, headers=headers, preload_content=False, decode_content=False)
+            try:
+                if resp.status != 206:
+                    raise RuntimeError(f"Range request for {url} returned HTTP {resp.status}")
+                buf = bytearray(STREAM_CHUNK_SIZE)
+                view = memoryview(buf)
+                offset = lo
+                while offset < hi and (n := resp.readinto(buf)):
+                    written = 0
+                    while written < n:
+                        written += os.pwrite(fd, view[written:n], offset + written)
+                    offset += n
+                if offset != hi:
+                    raise RuntimeError(f"Range {lo}-{hi - 1} of {url} ended at byte {offset}")
+            except BaseException:
+                resp.close()
+                raise
+            resp.release_conn()
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=RANGE_WORKERS) as executor:
+            for _ in executor.map(fetch, range(0, size, span)):
+                pass
+    return compute_sha256(dest)
+
+
+def download_file(url: str, dest: Path) -> str:
+    """Copy ``url`` to ``dest`` and return the SHA-256 of the bytes written."""
+
+    local = _local_path(url)
+    if local is not None:
+        _copy_file(local, dest)
+        return compute_sha256(dest)
+    size = _ranged_length(url)
+    if size is not None:
+        return _download_ranges(url, dest, size)
+    with open_source(url) as src, dest.open("wb") as fh:
+        reader = HashingReader(src, sink=fh)
+        reader.drain()
+    return reader.hexdigest()
+
+
+def _copy_file(src: Path, dst: Path) -> None:
+    """Copy file contents in the kernel: copy_file_range(), else shutil's sendfile() path."""
+
+    copy_range = getattr(os, "copy_file_range", None)
+    if copy_range is not None:
+        with src.open("rb") as fsrc, dst.open("wb") as fdst:
+            try:
+                while copy_range(fsrc.fileno(), fdst.fileno(), COPY_RANGE_SIZE):
+                    pass
+                return
+            except OSError as exc:
+                if exc.errno not in _COPY_RANGE_UNSUPPORTED:
+                    raise
+    shutil.copyfile(src, dst)
 
 
 def compute_sha256(path: Path) -> str:
-    digest = hashlib.sha256()
-    with path.open("rb") as fh:
-        for chunk in iter(lambda: fh.read(8192), b""):  # type: ignore[arg-type]
-            digest.update(chunk)
+    # Unbuffered: the chunks are already large, so a second buffer would only add a copy.
+    with path.open("rb", buffering=0) as fh:
+        if hasattr(hashlib, "file_digest"):  # Python 3.11+
+            return hashlib.file_digest(fh, "sha256").hexdigest()
+        digest = hashlib.sha256()
+        buf = bytearray(STREAM_CHUNK_SIZE)
+        view = memoryview(buf)
+        while n := fh.readinto(buf):
+            digest.update(view[:n])
     return digest.hexdigest()
 
 
 def verify_checksum(path: Path, expected: Optional[str]) -> None:
     if not expected:
         return
-    actual = compute_sha256(path)
-    if actual.lower() != expected.lower():
-        raise RuntimeError(f"Checksum mismatch for {path.name}: expected {expected}, got {actual}")
+    _check_digest(path.name, compute_sha256(path), expected)
+
+
+def _check_digest(name: str, actual: str, expected: Optional[str]) -> None:
+    if expected and actual.lower() != expected.lower():
+        raise RuntimeError(f"Checksum mismatch for {name}: expected {expected}, got {actual}")
 
 
 def _looks_like_windows_absolute(name: str) -> bool:
@@ -293,6 +534,10 @@ def _apply_mode(path: Path, mode: int) -> None:
 
 def _safe_extract_zip(zf: zipfile.ZipFile, dest: Path) -> None:
     dest.mkdir(parents=True, exist_ok=True)
+    # Every entry is validated and every directory created up front; the files are then
+    # inflated concurrently (zlib releases the GIL). Keyed by target so a duplicate
+    # entry still wins over earlier ones, as in a sequential extraction.
+    files: Dict[Path, Tuple[zipfile.ZipInfo, int]] = {}
     for info in zf.infolist():
         rel = _safe_archive_relative_path(info.filename)
         if rel == Path("."):
@@ -311,14 +556,25 @@ def _safe_extract_zip(zf: zipfile.ZipFile, dest: Path) -> None:
             continue
 
         target.parent.mkdir(parents=True, exist_ok=True)
+        files[target] = (info, mode)
+
+    def extract(target: Path) -> None:
+        info, mode = files[target]
         with zf.open(info) as src, target.open("wb") as dst:
-            shutil.copyfileobj(src, dst)
+            shutil.copyfileobj(src, dst, STREAM_CHUNK_SIZE)
         _apply_mode(target, mode)
 
+    from concurrent.futures import ThreadPoolExecutor
+
+    with ThreadPoolExecutor(max_workers=os.cpu_count() or 1) as executor:
+        for _ in executor.map(extract, files):
+            pass
+
 
 def _safe_extract_tar(tf: tarfile.TarFile, dest: Path) -> None:
     dest.mkdir(parents=True, exist_ok=True)
-    for member in tf.getmembers():
+    # Members are handled in archive order so streaming ("r|*") archives work too.
+    for member in tf:
         rel = _safe_archive_relative_path(member.name)
         if rel == Path("."):
             continue
@@ -343,31 +599,87 @@ def _safe_extract_tar(tf: tarfile.TarFile, dest: Path) -> None:
         raise RuntimeError(f"Unsupported tar entry type: {member.name}")
 
 
-def extract_archive(archive: Path, dest: Path) -> Path:
-    dest.mkdir(parents=True, exist_ok=True)
-    archive_type = None
+def _archive_type(name: str) -> str:
     for ext, kind in ARCHIVE_TYPES.items():
-        if str(archive).lower().endswith(ext):
-            archive_type = kind
-            break
-    if archive_type is None:
-        raise RuntimeError(f"Unsupported archive type: {archive}")
+        if name.lower().endswith(ext):
+            return kind
+    raise RuntimeError(f"Unsupported archive type: {name}")
+
 
+def _fresh_extract_dir(dest: Path) -> Path:
+    dest.mkdir(parents=True, exist_ok=True)
     temp_dir = dest / "_tmp"
     if temp_dir.exists():
         shutil.rmtree(temp_dir)
     temp_dir.mkdir(parents=True, exist_ok=True)
+    return temp_dir
+
+
+def _payload_root(temp_dir: Path) -> Path:
+    contents = list(temp_dir.iterdir())
+    return contents[0] if len(contents) == 1 and contents[0].is_dir() else temp_dir
+
+
+def extract_archive(archive: Path, dest: Path) -> Path:
+    archive_type = _archive_type(str(archive))
+    temp_dir = _fresh_extract_dir(dest)
 
     if archive_type == "zip":
         with zipfile.ZipFile(archive) as zf:
             _safe_extract_zip(zf, temp_dir)
     else:
-        with tarfile.open(archive, "r:*") as tf:
+        with _open_tar(archive) as tf:
             _safe_extract_tar(tf, temp_dir)
 
-    contents = list(temp_dir.iterdir())
-    root = contents[0] if len(contents) == 1 and contents[0].is_dir() else temp_dir
-    return root
+    return _payload_root(temp_dir)
+
+
+@contextlib.contextmanager
+def _open_tar(archive: Path) -> Iterator[tarfile.TarFile]:
+    if archive.name.lower().endswith((".tar.gz", ".tgz")):
+        try:  # pragma: no cover - optional dependency; parallel gzip for .tar.gz archives
+            import rapidgzip  # type: ignore
+        except Exception:  # pragma: no cover
+            rapidgzip = None  # type: ignore
+        if rapidgzip is not None:
+            # rapidgzip inflates the deflate stream on every core; tarfile only reads it.
+            with rapidgzip.RapidgzipFile(str(archive), parallelization=os.cpu_count() or 1) as fh:
+                with tarfile.open(fileobj=fh, mode="r|", bufsize=STREAM_CHUNK_SIZE) as tf:
+                    yield tf
+            return
+    with tarfile.open(archive, "r:*") as tf:
+        yield tf
+
+
+def fetch_archive(url: str, dest: Path, expected_sha256: Optional[str]) -> Path:
+    """Download, verify, and extract the archive at ``url`` under ``dest``.
+
+    Tar archives are extracted straight off the download stream while it is hashed, so
+    the archive is never written to or re-read from disk. Zip archives keep their index
+    at the end and need a seekable file, so they are hashed while being saved instead.
+    Large archives on servers that accept ``Range`` requests are saved with parallel
+    range downloads first, whatever their type. Either way the checksum is verified
+    before the payload is returned.
+    """
+
+    name = Path(urlparse(url).path).name
+    is_zip = _archive_type(name) == "zip"
+    size = None if is_zip else _ranged_length(url)
+    if is_zip or size is not None:
+        archive = dest / name
+        digest = download_file(url, archive) if size is None else _download_ranges(url, archive, size)
+        _check_digest(name, digest, expected_sha256)
+        return extract_archive(archive, dest)
+
+    temp_dir = _fresh_extract_dir(dest)
+    with open_source(url) as src:
+        reader = HashingReader(src)
+        with tarfile.open(fileobj=reader, mode="r|*", bufsize=STREAM_CHUNK_SIZE) as tf:  # type: ignore[arg-type]
+            _safe_extract_tar(tf, temp_dir)
+        # tarfile stops at the end-of-archive marker; hash the padding after it too.
+        reader.drain()
+    _check_digest(name, reader.hexdigest(), expected_sha256)
+    return _payload_root(temp_dir)
 
 
 def find_binary(root: Path) -> Path:
@@ -398,10 +710,37 @@ def install_payload(root: Path, install_root: Path) -> Path:
                 shutil.rmtree(destination)
             else:
                 destination.unlink()
-        shutil.move(str(item), destination)
+        _move(item, destination)
     return runtime_dir
 
 
+def _move(src: Path, dst: Path) -> None:
+    # A same-filesystem rename is O(1); only a tmpfs /tmp or similar needs the copy.
+    try:
+        os.rename(src, dst)
+        return
+    except OSError as exc:
+        if exc.errno != errno.EXDEV:
+            raise
+    _move_across_devices(src, dst)
+
+
+def _move_across_devices(src: Path, dst: Path) -> None:
+    if src.is_symlink():
+        os.symlink(os.readlink(src), dst)
+        src.unlink()
+    elif src.is_dir():
+        dst.mkdir()
+        for child in src.iterdir():
+            _move_across_devices(child, dst / child.name)
+        shutil.copystat(src, dst)
+        src.rmdir()
+    else:
+        _copy_file(src, dst)
+        shutil.copystat(src, dst)
+        src.unlink()
+
+
 def create_shim(binary: Path) -> Path:
     target_bin = bin_dir()
     target_bin.mkdir(parents=True, exist_ok=True)
@@ -418,11 +757,13 @@ def create_shim(binary: Path) -> Path:
 
 
 def _resolve_memory_home() -> Path:
-    if _core_resolve_memory_root is not None:
-        try:
-            return _core_resolve_memory_root()
-        except Exception:
-            pass
+    _ensure_paths()
+    try:  # pragma: no cover - optional dependency when core isn't bundled with bootstrapper
+        from interfaces.paths import resolve_memory_root  # type: ignore
+
+        return resolve_memory_root()
+    except Exception:  # pragma: no cover
+        pass
 
     override = os.getenv("NOCTICS_MEMORY_HOME")
     if override:
@@ -455,6 +796,18 @@ def _resolve_manifest_entry(
     return raw_entry
 
 
+def _read_install_state(install_root: Path) -> Dict[str, Any]:
+    try:
+        data = json.loads((install_root / INSTALL_STATE_FILE).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _write_install_state(install_root: Path, state: Dict[str, Any]) -> None:
+    (install_root / INSTALL_STATE_FILE).write_text(json.dumps(state, indent=2), encoding="utf-8")
+
+
 def run(
     manifest_ref: str,
     slug_override: Optional[str] = None,
@@ -472,20 +825,42 @@ def run(
     version = str(entry.get("version") or "unknown")
     build_label = entry.get("build")
     build_label = str(build_label) if build_label else None
+
+    install_root_dir = install_home()
+    state = _read_install_state(install_root_dir)
+    runtime_dir = install_root_dir / "runtime"
+    if (
+        not force
+        and sha256
+        and state.get("slug") == slug
+        and str(state.get("sha256") or "").lower() == str(sha256).lower()
+        and runtime_dir.is_dir()
+    ):
+        try:
+            binary = find_binary(runtime_dir)
+        except RuntimeError:
+            pass  # The recorded runtime lost its binary; reinstall it below.
+        else:
+            shim = create_shim(binary)
+            print(f"Noctics runtime {version} is already installed at {install_root_dir}")
+            return install_root_dir, shim
+
     with tempfile.TemporaryDirectory() as tmp:
-        tmp_path = Path(tmp) / Path(urlparse(url).path).name
-        download_file(url, tmp_path)
-        verify_checksum(tmp_path, sha256)
-        extract_root = extract_archive(tmp_path, Path(tmp))
+        extract_root = fetch_archive(url, Path(tmp), sha256)
 
-        install_root_dir = install_home()
         if force and install_root_dir.exists():
             shutil.rmtree(install_root_dir)
         install_root_dir.mkdir(parents=True, exist_ok=True)
+        # Dropped first so a half-replaced runtime is never mistaken for an up-to-date one.
+        (install_root_dir / INSTALL_STATE_FILE).unlink(missing_ok=True)
 
         runtime_dir = install_payload(extract_root, install_root_dir)
         binary = find_binary(runtime_dir)
         shim = create_shim(binary)
+        _write_install_state(
+            install_root_dir,
+            {"slug": slug, "sha256": sha256, "version": version, "build": build_label},
+        )
 
     ensure_global_config_home()
     try:
@@ -3,13 +3,14 @@
 from __future__ import annotations
 
 import importlib
-from typing import Iterable, List, Optional, Tuple, Type
+from typing import Dict, Iterable, Optional, Tuple, Type
 
 from nox_env import get_env
 
 from .base import BaseInstrument
 
-_REGISTRY: List[Type[BaseInstrument]] = []
+# Insertion-ordered set: O(1) duplicate checks, iterated in registration order.
+_REGISTRY: Dict[Type[BaseInstrument], None] = {}
 
 
 def register_instrument(cls: Type[BaseInstrument]) -> None:
@@ -18,8 +19,7 @@ def register_instrument(cls: Type[BaseInstrument]) -> None:
     Plugins can call this at import time to add themselves to the registry.
     """
 
-    if cls not in _REGISTRY:
-        _REGISTRY.append(cls)
+    _REGISTRY.setdefault(cls, None)
 
 
 def iter_instruments() -> Iterable[Type[BaseInstrument]]:
@@ -117,6 +117,84 @@ def test_bootstrap_installs_and_records_telemetry(tmp_path: Path, monkeypatch: p
     assert installs["last"]["build"] == "ci-999"
 
 
+def test_bootstrap_rejects_checksum_mismatch(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    dist_dir = tmp_path / "payload" / "noctics-core"
+    _create_stub_payload(dist_dir)
+
+    manifest_path = tmp_path / "manifest.json"
+    archive = _PACKAGER.package_runtime(
+        dist_dir,
+        tmp_path,
+        slug="linux-x86_64",
+        os_name="linux",
+        arch="x86_64",
+        manifest=manifest_path,
+        version="0.1.40",
+    )
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    manifest["linux-x86_64"]["url"] = archive.as_uri()
+    manifest["linux-x86_64"]["sha256"] = "0" * 64
+    manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+    install_home = tmp_path / "install"
+    bin_dir = tmp_path / "bin"
+    monkeypatch.setenv("NOCTICS_INSTALL_HOME", str(install_home))
+    monkeypatch.setenv("NOCTICS_BIN_DIR", str(bin_dir))
+
+    # The tar payload is extracted while it streams, but nothing may be installed.
+    with pytest.raises(RuntimeError, match="Checksum mismatch"):
+        bootstrap.run(str(manifest_path), slug_override="linux-x86_64", force=True)
+    assert not (install_home / "runtime").exists()
+    assert not (bin_dir / "noctics").exists()
+
+
+def test_bootstrap_skips_reinstall_of_unchanged_archive(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    dist_dir = tmp_path / "payload" / "noctics-core"
+    _create_stub_payload(dist_dir)
+
+    manifest_path = tmp_path / "manifest.json"
+    archive = _PACKAGER.package_runtime(
+        dist_dir,
+        tmp_path,
+        slug="linux-x86_64",
+        os_name="linux",
+        arch="x86_64",
+        manifest=manifest_path,
+        version="0.1.40",
+    )
+    manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+    manifest["linux-x86_64"]["url"] = archive.as_uri()
+    manifest_path.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+
+    install_home = tmp_path / "install"
+    monkeypatch.setenv("NOCTICS_INSTALL_HOME", str(install_home))
+    monkeypatch.setenv("NOCTICS_BIN_DIR", str(tmp_path / "bin"))
+    monkeypatch.setenv("NOCTICS_CONFIG_HOME", str(tmp_path / "config"))
+    monkeypatch.setenv("NOCTICS_MEMORY_HOME", str(tmp_path / "memory"))
+
+    bootstrap.run(str(manifest_path), slug_override="linux-x86_64")
+    state = json.loads((install_home / bootstrap.INSTALL_STATE_FILE).read_text(encoding="utf-8"))
+    assert state["sha256"] == manifest["linux-x86_64"]["sha256"]
+
+    def _no_fetch(*_args: object) -> Path:
+        raise AssertionError("unchanged archive must not be fetched again")
+
+    fetch_archive = bootstrap.fetch_archive
+    monkeypatch.setattr(bootstrap, "fetch_archive", _no_fetch)
+    install_root, shim = bootstrap.run(str(manifest_path), slug_override="linux-x86_64")
+    assert install_root == install_home
+    assert shim.exists()
+
+    with pytest.raises(AssertionError, match="must not be fetched"):
+        bootstrap.run(str(manifest_path), slug_override="linux-x86_64", force=True)
+
+    # A runtime that lost its binary is reinstalled even though the sha256 still matches.
+    monkeypatch.setattr(bootstrap, "fetch_archive", fetch_archive)
+    bootstrap.find_binary(install_home / "runtime").unlink()
+    bootstrap.run(str(manifest_path), slug_override="linux-x86_64")
+    assert bootstrap.find_binary(install_home / "runtime").exists()
+
+
 def test_record_cli_run_preserves_install_stats(tmp_path: Path) -> None:
     memory_root = tmp_path / "memory"
     now = datetime(2025, 1, 1, tzinfo=timezone.utc)